@@ -24,6 +24,7 @@ Theta Notation
 - O(2^n)
 - O(n!)
 '''
+from memoization import memoize
 
 # Examples
 
@@ -162,10 +163,12 @@ def selection_sort(lst):
 def insertion_sort(lst):
     i = 1
     while i < len(lst):
+        x = lst[i]
         j = i
-        while j > 0 and lst[j] < lst[j-1]:
-                lst[j], lst[j-1] = lst[j-1], lst[j]
-                j -= 1
+        while j > 0 and x < lst[j-1]: # shift right instead of swapping, x is written once at the end
+            lst[j] = lst[j-1]
+            j -= 1
+        lst[j] = x
         i += 1
 
 '''
@@ -193,6 +196,63 @@ def fibonacci(n):
         return n
     return fibonacci(n-1) + fibonacci(n-2)
 
+'''
+The same fibonacci, faster:
+- fibonacci_memo:      the recursion above with memoization, every fib(k) is computed once -> O(n)
+                       (still one stack frame per level, so it hits the recursion limit around n = 500)
+- fibonacci_iterative: keep only the last two numbers, O(n) time and O(1) space, no recursion
+- fibonacci_doubling:  fast doubling, from F(k) and F(k+1):
+                           F(2k)   = F(k) * (2F(k+1) - F(k))
+                           F(2k+1) = F(k)^2 + F(k+1)^2
+                       walk the bits of n from the top, double on every bit, step once more on the 1 bits -> O(log n)
+- fibonacci_matrix:    [[1, 1], [1, 0]]^n = [[F(n+1), F(n)], [F(n), F(n-1)]], raised by repeated squaring -> O(log n)
+                       same idea as doubling, with ~2x the multiplications
+
+NOTE: O(log n) counts arithmetic operations. fib(n) has ~0.7n bits, so the big-int multiplications dominate for large n,
+still fib(10^6) takes a fraction of a second with doubling, the iterative one needs many seconds, the plain recursion never finishes
+'''
+@memoize
+def fibonacci_memo(n): # O(n)
+    if n <= 1:
+        return n
+    return fibonacci_memo(n-1) + fibonacci_memo(n-2)
+
+def _check_fibonacci_index(n):
+    if n < 0: # the loops below would return 0, read the '-' of bin(n), or never stop
+        raise ValueError(f"fibonacci is defined for n >= 0, got {n}")
+
+def fibonacci_iterative(n): # O(n)
+    _check_fibonacci_index(n)
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+def fibonacci_doubling(n): # O(log n)
+    _check_fibonacci_index(n)
+    a, b = 0, 1 # F(k), F(k+1), starting at k = 0
+    for bit in bin(n)[2:]:
+        a, b = a * (2*b - a), a*a + b*b # k -> 2k
+        if bit == '1':
+            a, b = b, a + b             # 2k -> 2k + 1
+    return a
+
+def fibonacci_matrix(n): # O(log n)
+    _check_fibonacci_index(n)
+    def mul(x, y):
+        return (
+            x[0]*y[0] + x[1]*y[2], x[0]*y[1] + x[1]*y[3],
+            x[2]*y[0] + x[3]*y[2], x[2]*y[1] + x[3]*y[3],
+        )
+
+    res, base = (1, 0, 0, 1), (1, 1, 1, 0) # 2x2 matrices, row by row
+    while n:
+        if n & 1:
+            res = mul(res, base)
+        base = mul(base, base)
+        n >>= 1
+    return res[1]
+
 '''
 O(n!): Factorial time
 - algorithms that grows factorial time with the input size
@@ -206,13 +266,21 @@ try the next option
 i.e., agorithms that generate all permutations of a string
 '''
 def permute(str, left, right, res):
+    '''
+    swap() below rebuilds the whole string twice per branch (strings are immutable),
+    so the backtracking runs on a list buffer instead: swap in place, recurse, swap back, join only at the leaves
+    res still ends up with all n! permutations, see permutations.py to get them one at a time
+    '''
+    _permute(list(str), left, right, res)
+
+def _permute(buf, left, right, res):
     if left == right:
-        res.append(str)
+        res.append(''.join(buf))
     else:
         for i in range(left, right+1):
-            str = swap(str, left, i)
-            permute(str, left+1, right, res)
-            str = swap(str, left, i)
+            buf[left], buf[i] = buf[i], buf[left]
+            _permute(buf, left+1, right, res)
+            buf[left], buf[i] = buf[i], buf[left]
         
 
 def swap(str, i, j):
@@ -228,63 +296,15 @@ def swap(str, i, j):
     return str[:i] + str[j] + str[i+1:j] + str[i] + str[j+1:]
 
 def time_algorithms():
-    import timeit
-    
-    ls = [64, 34, 25, 12, 22, 11, 90, 88, 76, 50, 30]
-
-    all_time = {}
-
-    shared = {
-        **globals(),
-        'ls':ls
-    }
-
-    # Binary Search (need sorted list)
-    t = timeit.timeit('binary_search(ls, 50)', globals=shared, number=100_000)
-    all_time.update({'binary_search': t})
-
-    # Find Max
-    t = timeit.timeit('find_max(ls)', globals=shared, number=100_000)
-    all_time.update({'find_max': t})
-
-    # Merge Sort
-    t = timeit.timeit('merge_sort(ls[:])', globals=shared, number=10_000)
-    all_time.update({'merge_sort': t})
-    
-    # Insertion Sort
-    t = timeit.timeit('insertion_sort(ls[:])', globals=shared, number=10_000)
-    all_time.update({'insertion_sort': t})
-    
-    # Quick Sort
-    t = timeit.timeit('temp = ls[:]; quick_sort(temp, 0, len(temp)-1)', globals=shared, number=10_000)
-    all_time.update({'quick_sort': t})
-
-    # Merge Arrays
-    t = timeit.timeit('merge([25, 50, 76], [12, 34, 88])', globals=shared, number=100_000)
-    all_time.update({'merge': t})
-    
-    # String Swap
-    t = timeit.timeit('swap("ALGORITHM", 1, 4)', globals=shared, number=100_000)
-    all_time.update({'swap': t})
-    
-    # Permutations (using smaller string)
-    t = timeit.timeit('res = []; permute("ABCD", 0, 3, res)', globals=shared, number=100)
-    all_time.update({'permute': t})
-
     '''
-    {
-        "binary_search": 0.030827000009594485,
-        "find_max": 0.03251908300444484,
-        "merge_sort": 0.0510970419854857,
-        "insertion_sort": 0.02584241598378867,
-        "quick_sort": 0.03485125000588596,
-        "merge": 0.05001924998941831,
-        "swap": 0.022615583991864696,
-        "permute": 0.0013292919902596623
-    }
+    timing one 11-element list says nothing about growth, see benchmarks.py for the full suite
+    this runs its cases for the functions above, on a few small sizes and every input distribution
     '''
-
     import json
+    from benchmarks import ALGORITHMS, run_benchmarks
+
+    names = [name for name in ALGORITHMS if name.startswith('asymptotic.')]
+    all_time = run_benchmarks(names, sizes=[10, 100, 1000], repeats=5, log=None)
     print(json.dumps(all_time, indent=3))
 
 if __name__ == "__main__":
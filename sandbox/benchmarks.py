@@ -0,0 +1,248 @@
+'''
+Benchmark suite for the sorts and searches in sorting_algorithms.py, aymptotic_notation.py and recursion.py
+
+A single timing of one small list says nothing about how an algorithm scales,
+so every algorithm is run over:
+- input sizes growing geometrically (10, 100, ..., 10^7)
+- input distributions that hit different best/worst cases:
+    random, sorted, reversed, few_unique (lots of 'like' elements), organ_pipe (ascending then descending)
+
+For every (algorithm, distribution, size) it records the min / median / p95 wall time over several repeats,
+and the peak memory allocated during one extra run traced with tracemalloc
+(traced separately, tracemalloc slows everything down, so it would skew the timings).
+
+An algorithm stops moving to bigger sizes once the next run is projected to take longer than max_seconds,
+so O(n^2) sorts stop around 10^4 instead of running for days, and a RecursionError is recorded instead of crashing.
+
+Results are written as JSON or CSV, and compare() flags every case that got slower than a previous run.
+
+usage: python benchmarks.py --max-size 100000 --json out.json [--baseline old.json]
+'''
+import csv
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+import aymptotic_notation
+import recursion
+import sorting_algorithms
+
+SIZES = [10**i for i in range(1, 8)]
+DISTRIBUTIONS = ['random', 'sorted', 'reversed', 'few_unique', 'organ_pipe']
+QUERIES = 1000 # lookups per sample for the searches
+
+
+# Inputs
+
+def make_input(distribution, n, seed=0):
+    rng = random.Random(seed)
+    if distribution == 'random':
+        return [rng.randint(0, 10 * n) for _ in range(n)]
+    if distribution == 'sorted':
+        return list(range(n))
+    if distribution == 'reversed':
+        return list(range(n, 0, -1))
+    if distribution == 'few_unique':
+        return [rng.randint(0, 9) for _ in range(n)]
+    if distribution == 'organ_pipe':
+        half = n // 2
+        return list(range(half)) + list(range(n - half, 0, -1))
+    raise ValueError(f"unknown distribution {distribution!r}")
+
+
+# Algorithms under test
+# each one is (name, run) where run(data) returns a zero-argument callable doing the work on fresh input,
+# so copying the input never ends up inside the timing
+
+def _in_place(sort, *bounds):
+    def run(data):
+        arr = data[:]
+        if bounds:
+            return lambda: sort(arr, 0, len(arr) - 1)
+        return lambda: sort(arr)
+    return run
+
+def _searches(search, recursive=False):
+    '''
+    a single lookup is too fast to time, so every sample is a batch of QUERIES lookups
+    '''
+    def run(data):
+        arr = sorted(data)
+        rng = random.Random(1)
+        targets = [rng.choice(arr) if arr else 0 for _ in range(QUERIES)]
+        if recursive:
+            return lambda: [search(arr, t, 0, len(arr) - 1) for t in targets]
+        return lambda: [search(arr, t) for t in targets]
+    return run
+
+ALGORITHMS = {
+    # sorting_algorithms.py
+    'sorting.bubble_sort': _in_place(sorting_algorithms.bubble_sort),
+    'sorting.selection_sort': _in_place(sorting_algorithms.selection_sort),
+    'sorting.insertion_sort': _in_place(sorting_algorithms.insertion_sort),
+    'sorting.binary_insertion_sort': _in_place(sorting_algorithms.binary_insertion_sort),
+    'sorting.merge_sort': lambda data: lambda: sorting_algorithms.merge_sort(data),
+    'sorting.natural_merge_sort': _in_place(sorting_algorithms.natural_merge_sort),
+    'sorting.quick_sort': _in_place(sorting_algorithms.quick_sort, True),
+    'sorting.intro_sort': _in_place(sorting_algorithms.intro_sort),
+    'sorting.heap_sort': _in_place(sorting_algorithms.heap_sort),
+    'sorting.counting_sort': _in_place(sorting_algorithms.counting_sort),
+    'sorting.radix_sort': _in_place(sorting_algorithms.radix_sort),
+    'sorting.auto_sort': _in_place(sorting_algorithms.auto_sort),
+    # aymptotic_notation.py
+    'asymptotic.merge_sort': lambda data: lambda: aymptotic_notation.merge_sort(data),
+    'asymptotic.quick_sort': _in_place(aymptotic_notation.quick_sort, True),
+    'asymptotic.selection_sort': _in_place(aymptotic_notation.selection_sort),
+    'asymptotic.insertion_sort': _in_place(aymptotic_notation.insertion_sort),
+    'asymptotic.binary_search': _searches(aymptotic_notation.binary_search),
+    'asymptotic.find_max': lambda data: lambda: aymptotic_notation.find_max(data),
+    # recursion.py
+    'recursion.quick_sort_iterative': _in_place(recursion.quick_sort_iterative, True),
+    'recursion.quick_sort_recursive': _in_place(recursion.quick_sort_recursive, True),
+    'recursion.binary_search_recursive': _searches(recursion.binary_search_recursive, True),
+}
+
+
+# Measuring
+
+def measure(run, data, repeats):
+    '''
+    returns (times in seconds, peak traced bytes)
+    '''
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable() # a collection in the middle of one sample is noise, not the algorithm
+    try:
+        for _ in range(repeats):
+            work = run(data)
+            start = time.perf_counter()
+            work()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    work = run(data)
+    tracemalloc.start()
+    try:
+        work()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+def percentile(values, p):
+    '''
+    nearest-rank percentile
+    '''
+    values = sorted(values)
+    idx = max(0, min(len(values) - 1, -(-p * len(values) // 100) - 1))
+    return values[int(idx)]
+
+def run_benchmarks(algorithms=None, distributions=DISTRIBUTIONS, sizes=SIZES, repeats=5, max_seconds=1.0, log=print):
+    '''
+    returns a list of result rows (dicts), one per (algorithm, distribution, size)
+    '''
+    algorithms = algorithms or list(ALGORITHMS)
+    results = []
+    for name in algorithms:
+        run = ALGORITHMS[name]
+        for distribution in distributions:
+            prev_median = None
+            for n in sizes:
+                row = {'algorithm': name, 'distribution': distribution, 'n': n}
+                try:
+                    times, peak = measure(run, make_input(distribution, n), repeats)
+                except RecursionError:
+                    row['error'] = 'RecursionError'
+                    results.append(row)
+                    if log:
+                        log(f"{name:40} {distribution:12} {n:>10}  RecursionError")
+                    break
+                row.update(
+                    min=min(times),
+                    median=statistics.median(times),
+                    p95=percentile(times, 95),
+                    peak_bytes=peak,
+                )
+                results.append(row)
+                if log:
+                    log(f"{name:40} {distribution:12} {n:>10}  median {row['median']:.6f}s  peak {peak} B")
+                # project the next size with the growth seen between the last two sizes (~10x for O(n), ~100x for O(n^2))
+                growth = row['median'] / prev_median if prev_median else 10
+                if row['median'] * max(growth, 1) > max_seconds:
+                    break
+                prev_median = row['median']
+    return results
+
+
+# Reports
+
+FIELDS = ['algorithm', 'distribution', 'n', 'min', 'median', 'p95', 'peak_bytes', 'error']
+
+def write_json(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def write_csv(results, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(baseline, current, tolerance=0.2):
+    '''
+    returns the cases whose median time or peak memory grew by more than tolerance (20% by default)
+    only cases present in both runs are compared
+    '''
+    old = {(r['algorithm'], r['distribution'], r['n']): r for r in baseline}
+    regressions = []
+    for row in current:
+        prev = old.get((row['algorithm'], row['distribution'], row['n']))
+        if prev is None:
+            continue
+        if 'error' in row and 'error' not in prev:
+            regressions.append({**row, 'metric': 'error', 'before': None, 'after': row['error']})
+            continue
+        for metric in ('median', 'peak_bytes'):
+            if metric in prev and metric in row and row[metric] > prev[metric] * (1 + tolerance):
+                regressions.append({**row, 'metric': metric, 'before': prev[metric], 'after': row[metric]})
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="benchmark the sorts and searches")
+    parser.add_argument('--algorithms', nargs='*', choices=list(ALGORITHMS), default=None)
+    parser.add_argument('--distributions', nargs='*', choices=DISTRIBUTIONS, default=DISTRIBUTIONS)
+    parser.add_argument('--max-size', type=int, default=10**7)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=1.0)
+    parser.add_argument('--json')
+    parser.add_argument('--csv')
+    parser.add_argument('--baseline', help="previous --json output to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.algorithms, args.distributions, [n for n in SIZES if n <= args.max_size],
+        args.repeats, args.max_seconds,
+    )
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.baseline:
+        regressions = compare(load_json(args.baseline), results, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['algorithm']} {r['distribution']} n={r['n']} {r['metric']}: {r['before']} -> {r['after']}")
+        sys.exit(1 if regressions else 0)
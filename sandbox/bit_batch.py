@@ -0,0 +1,233 @@
+'''
+Bit operations over whole arrays
+
+count_bit_kernighan, get_lsb_pos, get_msb_pos and find_unique in bit_manipulation.py handle ONE int per call,
+so tens of millions of values mean tens of millions of Python-level loops. The functions here take the whole batch:
+- popcount(data):     number of set bits of every value
+- parity(data):       popcount & 1 of every value
+- lsb(data):          position of the lowest set bit of every value (-1 for 0)
+- msb(data):          position of the highest set bit of every value (-1 for 0)
+- find_unique(data):  XOR of all the values (the value that appears an odd number of times)
+- total_popcount(data)
+
+data can be:
+1. a NumPy array:  everything runs vectorized, one NumPy operation per step for the whole array
+       popcount: SWAR (SIMD Within A Register), sums bits in pairs, then nibbles, then bytes, without looping over bits
+           x = x - ((x >> 1) & 0x5555...)                 every 2 bits hold their own count
+           x = (x & 0x3333...) + ((x >> 2) & 0x3333...)   every 4 bits
+           x = (x + (x >> 4)) & 0x0f0f...                 every byte
+           (x * 0x0101...) >> 56                          the multiply adds all the bytes into the top one
+       lsb:      de Bruijn: (x & -x) isolates the lowest bit, multiplying a de Bruijn constant by it puts a
+                 unique 6-bit pattern in the top bits, a 64-entry table maps the pattern to the position
+       msb:      smear the highest bit into every lower bit (x |= x >> 1, 2, 4, ...), then popcount - 1
+2. an array.array or a list: no NumPy, so the per-value work goes through C helpers instead of Python loops:
+       int.bit_count / int.bit_length mapped over the values, and bytes.translate as a 256-entry lookup table
+       popcount of an array never looks at a value one by one: translate gives every BYTE its popcount,
+       byte j of every word is picked out with a strided slice (raw[j::itemsize]), and adding those slices
+       as big ints sums the bytes of every word at once (at most 64 per word, so nothing carries into the next byte)
+       find_unique folds the array as one big int: XOR the upper half of the words into the lower half, repeat
+3. an iterator of chunks (i.e., chunked(stream)): processed one chunk at a time, so memory stays constant
+       the element-wise functions then return a generator of result chunks, the reductions return one number
+
+NOTE:
+Values are unsigned words (at most 64 bits): signed arrays are reinterpreted as unsigned of the same width
+(two's complement), so an int32 -1 has 32 set bits. Lists must hold non-negative ints.
+find_unique gives back a value of the input's own type: signed in, signed out.
+Without NumPy, popcount over an array is ~50-65x faster than count_bit_kernighan in a loop
+(~30x with int.bit_count mapped over the values), with NumPy ~120x.
+'''
+from array import array
+from functools import reduce
+from itertools import islice
+from operator import xor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 1 << 16
+
+_UNSIGNED = {'b': 'B', 'h': 'H', 'i': 'I', 'l': 'L', 'q': 'Q'}
+_POPCOUNT_OF_BYTE = bytes(i.bit_count() for i in range(256))     # byte -> its popcount
+_PARITY_OF_COUNT = bytes(i & 1 for i in range(256))             # popcount -> parity
+_MINUS_ONE = bytes((i - 1) & 0xFF for i in range(256))          # bit_length -> position, as a signed byte
+
+_M1, _M2, _M4, _H01 = 0x5555555555555555, 0x3333333333333333, 0x0F0F0F0F0F0F0F0F, 0x0101010101010101
+_DE_BRUIJN = 0x03F79D71B4CB0A89
+_DE_BRUIJN_TABLE = [0] * 64
+for _i in range(64):
+    _DE_BRUIJN_TABLE[((1 << _i) * _DE_BRUIJN & 0xFFFFFFFFFFFFFFFF) >> 58] = _i
+
+
+def chunked(iterable, size=CHUNK_SIZE, typecode='Q'):
+    '''
+    groups a stream of ints into array(typecode) chunks of size values
+    '''
+    it = iter(iterable)
+    while True:
+        chunk = array(typecode, islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _is_chunks(data):
+    return not hasattr(data, '__len__')
+
+def _is_ndarray(data):
+    return np is not None and isinstance(data, np.ndarray)
+
+def _words(data):
+    '''
+    array/list -> values as non-negative ints (signed arrays reinterpreted as unsigned)
+    '''
+    if isinstance(data, array) and data.typecode in _UNSIGNED:
+        return array(_UNSIGNED[data.typecode], data.tobytes())
+    return data
+
+def _np_words(data):
+    if data.dtype.kind == 'i':
+        data = data.view(data.dtype.str.replace('i', 'u'))
+    return data.astype(np.uint64, copy=False)
+
+
+# NumPy kernels
+
+def _np_popcount(x):
+    x = _np_words(x)
+    x = x - ((x >> np.uint64(1)) & np.uint64(_M1))
+    x = (x & np.uint64(_M2)) + ((x >> np.uint64(2)) & np.uint64(_M2))
+    x = (x + (x >> np.uint64(4))) & np.uint64(_M4)
+    return ((x * np.uint64(_H01)) >> np.uint64(56)).astype(np.uint8)
+
+def _np_lsb(x):
+    x = _np_words(x)
+    low = x & (~x + np.uint64(1)) # x & -x
+    res = np.asarray(_DE_BRUIJN_TABLE, dtype=np.int8)[(low * np.uint64(_DE_BRUIJN)) >> np.uint64(58)]
+    res[x == 0] = -1
+    return res
+
+def _np_msb(x):
+    x = _np_words(x).copy()
+    for shift in (1, 2, 4, 8, 16, 32):
+        x |= x >> np.uint64(shift)
+    return _np_popcount(x).astype(np.int8) - np.int8(1)
+
+
+# array.array kernels
+
+def _array_popcount(data):
+    size = data.itemsize
+    raw = data.tobytes().translate(_POPCOUNT_OF_BYTE)
+    total = sum(int.from_bytes(raw[j::size], 'little') for j in range(size))
+    return array('B', total.to_bytes(len(data), 'little'))
+
+def _array_xor(data):
+    bits = 8 * data.itemsize
+    words, x = len(data), int.from_bytes(data.tobytes(), 'little')
+    while words > 1:
+        half = (words + 1) // 2
+        x = (x & ((1 << half * bits) - 1)) ^ (x >> half * bits)
+        words = half
+    if data.typecode in _UNSIGNED and x >> (bits - 1): # signed typecode, back to two's complement
+        x -= 1 << bits
+    return x
+
+def _py_popcount(words):
+    if isinstance(words, array):
+        return _array_popcount(words)
+    return array('B', map(int.bit_count, words))
+
+
+# Element-wise
+
+def _elementwise(data, np_kernel, py_kernel):
+    if _is_chunks(data):
+        return (_elementwise(chunk, np_kernel, py_kernel) for chunk in data)
+    if _is_ndarray(data):
+        return np_kernel(data)
+    return py_kernel(_words(data))
+
+def popcount(data):
+    return _elementwise(data, _np_popcount, _py_popcount)
+
+def parity(data):
+    return _elementwise(
+        data,
+        lambda x: _np_popcount(x) & np.uint8(1),
+        lambda w: array('B', _py_popcount(w).tobytes().translate(_PARITY_OF_COUNT)),
+    )
+
+def lsb(data):
+    return _elementwise(
+        data,
+        _np_lsb,
+        lambda w: array('b', bytes(map(int.bit_length, [x & -x for x in w])).translate(_MINUS_ONE)),
+    )
+
+def msb(data):
+    return _elementwise(
+        data,
+        _np_msb,
+        lambda w: array('b', bytes(map(int.bit_length, w)).translate(_MINUS_ONE)),
+    )
+
+
+# Reductions
+
+def find_unique(data):
+    '''
+    XOR of every value: when all values but one appear twice, that's the one
+    signed input gives a signed result (XOR works the same on two's complement, only the reading differs)
+    '''
+    if _is_chunks(data):
+        return reduce(xor, map(find_unique, data), 0)
+    if _is_ndarray(data):
+        words = data if data.dtype.kind in 'iu' else _np_words(data)
+        return int(np.bitwise_xor.reduce(words)) if data.size else 0
+    if isinstance(data, array):
+        return _array_xor(data)
+    return reduce(xor, data, 0)
+
+def total_popcount(data):
+    if _is_chunks(data):
+        return sum(map(total_popcount, data))
+    if _is_ndarray(data):
+        return int(_np_popcount(data).sum(dtype=np.uint64))
+    data = _words(data)
+    if isinstance(data, array):
+        return int.from_bytes(data.tobytes(), 'little').bit_count() # all the words as one big int
+    return sum(map(int.bit_count, data))
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    values = array('Q', (random.getrandbits(64) for _ in range(1_000_000)))
+
+    def kernighan(num):
+        c = 0
+        while num > 0:
+            num &= num - 1
+            c += 1
+        return c
+
+    start = time.perf_counter()
+    expected = [kernighan(x) for x in values]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert list(popcount(values)) == expected
+    print(f"array: {scalar / (time.perf_counter() - start):.0f}x faster than count_bit_kernighan in a loop")
+
+    if np is not None:
+        arr = np.frombuffer(values, dtype=np.uint64)
+        start = time.perf_counter()
+        assert popcount(arr).tolist() == expected
+        print(f"numpy: {scalar / (time.perf_counter() - start):.0f}x faster than count_bit_kernighan in a loop")
+
+    stream = (x for x in values) # one value at a time, never all in memory
+    assert total_popcount(chunked(stream)) == sum(expected)
+    assert find_unique([3, 9, 4, 9, 3]) == 4 == find_unique(array('q', [3, 9, 4, 9, 3]))
+    assert find_unique(array('q', [-5, 3, 3])) == -5
@@ -44,7 +44,7 @@ def set_bit(n, pos):
 '''
 def flip_bit(n, pos):
     mask = 1 << pos
-    return n ^ pos
+    return n ^ mask
 
 def find_unique(arr):
     res = 0
@@ -112,6 +112,94 @@ def swap(a, b):
     b. for negative numbers, result bits will always be positive (or 0)
 '''
 
+'''
+8. Shift and mask together
+    - shifting right by k, then masking the lowest b bits, reads a b-bit field starting at bit k
+    - i.e., the k-th byte of n is (n >> 8*k) & 0xFF, this is how radix sort reads its digits
+
+    NOTE:
+    clearing every bit from the MSB down to bit 'end' is the same as AND-ing with (1 << end) - 1
+'''
+def clear_bits_from_msb(num, end=0):
+    if end <= 0:
+        return 0
+    mask = (1 << end) - 1 # exclusive
+    return num & mask
+
+'''
+9. Enumerating subsets, one at a time
+    - a mask from 0 to 2^n - 1 IS a subset of n items (bit j set -> items[j] is in), so nothing has to be stored
+    - reading the items of a mask: take the lowest set bit (mask & -mask), clear it (mask ^ low), repeat
+      one step per item IN the subset, instead of testing all n bits like get_all_subsets does
+
+    Orders:
+    a. counting order: 0, 1, 2, 3, ...               (iter_subsets)
+    b. Gray code: k ^ (k >> 1), consecutive masks differ in exactly ONE bit, the lowest set bit of k
+       so a running aggregate (a sum, a count) is updated with one item per step instead of recomputed (gray_code)
+    c. only the subsets of size k: Gosper's hack jumps from one k-bit mask straight to the next bigger one (gosper)
+        low    = mask & -mask          lowest set bit
+        ripple = mask + low            carries the lowest block of 1s one position up
+        next   = ripple | (((mask ^ ripple) >> 2) // low)   the rest of that block goes back to the bottom
+    d. every submask of a mask: sub = (sub - 1) & mask, from mask down to 0 (submasks)
+       over all masks this is 3^n steps in total, not 4^n
+'''
+def mask_to_subset(items, mask):
+    res = []
+    while mask:
+        low = mask & -mask
+        res.append(items[low.bit_length() - 1])
+        mask ^= low
+    return res
+
+def iter_subsets(items, k=None): # O(2^n) subsets, O(|subset|) each
+    '''
+    yields every subset of items as a list, in counting order (the same order as get_all_subsets)
+    k: only the subsets with k items, via gosper
+    '''
+    items = list(items)
+    masks = range(1 << len(items)) if k is None else gosper(len(items), k)
+    for mask in masks:
+        yield mask_to_subset(items, mask)
+
+def gray_code(n): # O(1) per step
+    '''
+    yields (mask, flipped) for all 2^n masks, starting from 0, each differing from the previous one in bit 'flipped'
+    (flipped is None for the first mask), the item was added if mask has that bit set, removed otherwise
+    '''
+    yield 0, None
+    for k in range(1, 1 << n):
+        yield k ^ (k >> 1), (k & -k).bit_length() - 1
+
+def gosper(n, k): # O(1) per step
+    '''
+    yields the masks of n bits with exactly k bits set, in increasing order
+    '''
+    if k < 0 or k > n:
+        return
+    if k == 0:
+        yield 0
+        return
+    mask, limit = (1 << k) - 1, 1 << n
+    while mask < limit:
+        yield mask
+        low = mask & -mask
+        ripple = mask + low
+        mask = ripple | (((mask ^ ripple) >> 2) // low)
+
+def submasks(mask, proper=False): # O(1) per step
+    '''
+    yields every submask of mask (mask itself and 0 included), in decreasing order
+    proper=True skips mask itself
+    '''
+    if proper and not mask:
+        return
+    sub = (mask - 1) & mask if proper else mask
+    while True:
+        yield sub
+        if sub == 0:
+            return
+        sub = (sub - 1) & mask
+
 # PRACTICE
 
 def test_bit_manipulation():
@@ -227,6 +315,7 @@ def test_bit_manipulation():
     - Check if item k is present: (set & (1 << k)) != 0
     '''
     # Iterate through all subsets of a set (bitmasks) represented by n:
+    # NOTE: this builds all 2^n lists up front, see iter_subsets (section 9) for the streaming version
     def get_all_subsets(arr):
         n = len(arr)
         subsets, subset = [], []
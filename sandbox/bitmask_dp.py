@@ -0,0 +1,207 @@
+'''
+Bitmask dynamic programming
+
+Brute force over subsets is O(2^n * n) and over orderings O(n!) (aymptotic_notation.py).
+Most of those searches only care WHICH items were used so far, not in what order, so the state is a mask:
+one table entry per subset (times a small extra index), filled from smaller subsets.
+- n = 20 is 2^20 = ~1M masks: fine for a table, while 20! orderings is 2.4 * 10^18
+
+The tables are typed arrays (array('q'), array('d'), or NumPy arrays), indexed by the mask:
+8 bytes per entry instead of a Python int or float object plus a list pointer.
+
+- subset_sums:      sums[mask] for every mask, O(2^n): each mask is a smaller mask plus its lowest set bit
+- sos / sos_inverse: SOS (sum over subsets) transform, g[mask] = sum of f[sub] over every submask sub, O(n 2^n)
+                     done one bit at a time: after step i, g[mask] sums over the submasks that differ in bits < i
+                     the inverse (Mobius) undoes it with subtractions, superset=True does the same over supersets
+- held_karp:        shortest round trip through n cities, dp[mask][last] = shortest path from city 0 through
+                    the cities in mask, ending at last. O(2^n n^2) instead of O(n!) orderings
+- best_partition:   cheapest way to split the items into groups, dp[mask] = min over submasks (3^n in total)
+'''
+from array import array
+from operator import add, sub
+
+from bit_manipulation import submasks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INF = float('inf')
+
+
+def subset_sums(values, typecode='q'): # O(2^n)
+    '''
+    array where sums[mask] = sum of values[j] for every bit j set in mask
+    '''
+    n = len(values)
+    sums = array(typecode, [0]) * (1 << n)
+    for mask in range(1, 1 << n):
+        low = mask & -mask
+        sums[mask] = sums[mask ^ low] + values[low.bit_length() - 1]
+    return sums
+
+
+def sos(f, superset=False): # O(n 2^n)
+    '''
+    in place: f[mask] becomes the sum of the old f over every submask of mask (every superset with superset=True)
+    len(f) must be a power of 2
+    '''
+    _transform(f, add, superset)
+    return f
+
+def sos_inverse(f, superset=False): # O(n 2^n)
+    '''
+    in place, undoes sos (the Mobius transform)
+    '''
+    _transform(f, sub, superset)
+    return f
+
+def _transform(f, op, superset):
+    '''
+    for bit i, the masks come in blocks of 2 * step: the first half has bit i clear, the second half set
+    subsets:   second half op= first half     supersets: first half op= second half
+    one slice operation per block instead of one Python step per mask
+    '''
+    size = len(f)
+    if size & (size - 1):
+        raise ValueError("the table size must be a power of 2")
+    step = 1
+    while step < size:
+        if np is not None and isinstance(f, np.ndarray):
+            blocks = f.reshape(-1, 2, step)
+            lo, hi = (blocks[:, 1, :], blocks[:, 0, :]) if superset else (blocks[:, 0, :], blocks[:, 1, :])
+            hi[...] = op(hi, lo)
+        else:
+            for start in range(0, size, 2 * step):
+                lo, hi = (start + step, start) if superset else (start, start + step)
+                res = map(op, f[hi:hi + step], f[lo:lo + step])
+                f[hi:hi + step] = array(f.typecode, res) if isinstance(f, array) else list(res)
+        step <<= 1
+
+
+def held_karp(dist): # O(2^n n^2)
+    '''
+    dist: n x n matrix (list of lists), returns (length, tour) of the shortest round trip starting and ending at city 0
+    '''
+    n = len(dist)
+    if n <= 1:
+        return 0, [0] * (2 * n) # [] or the trip [0, 0]
+    if np is not None:
+        return _np_held_karp(np.asarray(dist, dtype=np.float64))
+
+    # forward: extend every known path by one city not in it, masks only grow, so increasing order is enough
+    full = 1 << n
+    dp = array('d', [INF]) * (full * n)     # dp[mask * n + last]
+    parent = array('i', [-1]) * (full * n)
+    dp[1 * n + 0] = 0
+    for mask in range(1, full, 2): # only the masks containing city 0
+        for last in range(n):
+            cur = dp[mask * n + last]
+            if cur == INF:
+                continue
+            for nxt in range(n):
+                if mask >> nxt & 1:
+                    continue
+                idx = (mask | 1 << nxt) * n + nxt
+                if cur + dist[last][nxt] < dp[idx]:
+                    dp[idx] = cur + dist[last][nxt]
+                    parent[idx] = last
+    mask = full - 1
+    best, last = min((dp[mask * n + j] + dist[j][0], j) for j in range(1, n))
+    tour = []
+    while last != -1:
+        tour.append(last)
+        mask, last = mask ^ (1 << last), parent[mask * n + last]
+    tour.reverse()
+    return best, tour + [0]
+
+def _np_held_karp(dist):
+    '''
+    same DP, backward and vectorized: the masks are over cities 1..n-1 (bit j = city j+1, city 0 is the start),
+    grouped by size, for each last city j all the masks of one size containing j are filled in one step:
+        dp[mask, j] = min over k of dp[mask without j, k] + dist[k, j]
+    '''
+    from bit_batch import popcount
+
+    n = len(dist)
+    m = n - 1
+    d = dist[1:, 1:]
+    dp = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int8 if m < 127 else np.int16)
+    for j in range(m):
+        dp[1 << j, j] = dist[0, j + 1]
+    sizes = popcount(np.arange(1 << m, dtype=np.uint64))
+    for size in range(2, m + 1):
+        masks = np.flatnonzero(sizes == size)
+        for j in range(m):
+            sel = masks[(masks >> j) & 1 == 1]
+            cand = dp[sel ^ (1 << j)] + d[:, j]
+            parent[sel, j] = cand.argmin(axis=1)
+            dp[sel, j] = cand[np.arange(len(sel)), parent[sel, j]]
+
+    mask = (1 << m) - 1
+    closing = dp[mask] + dist[1:, 0]
+    last = int(closing.argmin())
+    best = float(closing[last])
+    tour = []
+    while mask:
+        tour.append(last + 1)
+        mask, last = mask ^ (1 << last), int(parent[mask, last])
+    tour.reverse()
+    return best, [0] + tour + [0]
+
+
+def best_partition(n, cost): # O(3^n)
+    '''
+    cost: table (len 2^n) of the cost of putting exactly the items of mask in one group
+    returns (total cost, groups as masks) of the cheapest split of all n items into groups
+    every group is a submask of what's left, and it must contain the lowest item left, so each split is counted once
+    '''
+    full = 1 << n
+    dp = array('d', [INF]) * full
+    choice = array('q', [0]) * full
+    dp[0] = 0
+    for mask in range(1, full):
+        low = mask & -mask
+        rest = mask ^ low
+        for s in submasks(rest): # the group is low + s
+            group = s | low
+            c = cost[group] + dp[mask ^ group]
+            if c < dp[mask]:
+                dp[mask], choice[mask] = c, group
+    groups, mask = [], full - 1
+    while mask:
+        groups.append(choice[mask])
+        mask ^= choice[mask]
+    return dp[full - 1], groups
+
+
+if __name__ == "__main__":
+    import itertools
+    import random
+
+    values = [3, 5, 8, 13]
+    sums = subset_sums(values)
+    assert sums[0b1011] == 3 + 5 + 13
+
+    f = array('q', range(16))
+    g = sos(array('q', f))
+    assert g[0b0101] == f[0] + f[1] + f[4] + f[5] and sos_inverse(g) == f
+
+    n = 8
+    pts = [(random.random(), random.random()) for _ in range(n)]
+    dist = [[((ax - bx)**2 + (ay - by)**2) ** 0.5 for bx, by in pts] for ax, ay in pts]
+    length, tour = held_karp(dist)
+    brute = min(
+        sum(dist[a][b] for a, b in zip((0,) + p, p + (0,)))
+        for p in itertools.permutations(range(1, n))
+    )
+    assert abs(length - brute) < 1e-9 and sorted(tour[:-1]) == list(range(n))
+
+    # split 6 items into groups, a group costs 1 + (its sum - 10)^2
+    items = [2, 8, 4, 6, 9, 1]
+    group_sums = subset_sums(items)
+    cost = [1 + (s - 10) ** 2 for s in group_sums]
+    total, groups = best_partition(len(items), cost)
+    print(total, [[items[j] for j in range(len(items)) if g >> j & 1] for g in groups])
@@ -0,0 +1,193 @@
+'''
+Bitset
+
+"Representing Sets (Bitmasks)" in bit_manipulation.py stores a set of small integers in ONE int, bit k set -> k is in.
+A Bitset is the same idea for millions of members: the bits live in an array of 64-bit words (array('Q')),
+member i is bit i % 64 of word i // 64.
+- memory: 1 bit per POSSIBLE member, 10^6 ids fit in 125 KB, a Python set of them needs ~30+ MB
+- union / intersection / difference are whole-word |, &, & ~ (done in C: all the words become one big int and back)
+- the per-bit operations are the helpers from bit_manipulation.py, applied to one word
+
+NOTE:
+- popcount over the whole set is done the same way, int.bit_count() on that big int
+- iteration visits only the set bits: take the lowest one of a word (w & -w), clear it, repeat
+- rank(i) is how many members are < i, select(k) is the k-th smallest member (0-based), rank(select(k)) == k
+'''
+from array import array
+
+from bit_manipulation import clear_bit, clear_bits_from_msb, flip_bit, is_bit_set, set_bit
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+
+class Bitset:
+    __slots__ = ('_words', '_size')
+
+    def __init__(self, size, members=()):
+        '''
+        size: members are 0 .. size-1
+        '''
+        if size < 0:
+            raise ValueError("size must be >= 0")
+        self._size = size
+        self._words = array('Q', bytes(8 * (-(-size // WORD_BITS))))
+        for i in members:
+            self.set(i)
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self.count()
+
+    def __repr__(self):
+        return f"Bitset({self._size}, {list(self)!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Bitset):
+            return NotImplemented
+        return self._size == other._size and self._words == other._words
+
+    def copy(self):
+        res = Bitset(0)
+        res._size, res._words = self._size, array('Q', self._words)
+        return res
+
+    def nbytes(self):
+        return len(self._words) * self._words.itemsize
+
+    # Single bits O(1)
+
+    def _check(self, i):
+        if not 0 <= i < self._size:
+            raise IndexError(f"bit {i} out of range for a Bitset of size {self._size}")
+
+    def set(self, i):
+        self._check(i)
+        w = i >> 6 # i // 64
+        self._words[w] = set_bit(self._words[w], i & 63)
+
+    def clear(self, i):
+        self._check(i)
+        w = i >> 6
+        self._words[w] = clear_bit(self._words[w], i & 63)
+
+    def toggle(self, i):
+        self._check(i)
+        w = i >> 6
+        self._words[w] = flip_bit(self._words[w], i & 63)
+
+    def test(self, i):
+        self._check(i)
+        return bool(is_bit_set(self._words[i >> 6], i & 63))
+
+    def __contains__(self, i):
+        return 0 <= i < self._size and bool(is_bit_set(self._words[i >> 6], i & 63))
+
+    # Ranges O(n / 64)
+
+    def set_range(self, start, stop):
+        self._fill_range(start, stop, True)
+
+    def clear_range(self, start, stop):
+        self._fill_range(start, stop, False)
+
+    def _fill_range(self, start, stop, value):
+        '''
+        bits start .. stop-1: the partial words at both ends are masked, the whole words in between are overwritten
+        '''
+        start, stop = max(start, 0), min(stop, self._size)
+        if start >= stop:
+            return
+        words = self._words
+        first, last = start >> 6, (stop - 1) >> 6
+        for w in range(first, last + 1):
+            lo = start - (w << 6) if w == first else 0
+            hi = stop - (w << 6) if w == last else WORD_BITS
+            mask = clear_bits_from_msb(WORD_MASK, hi) >> lo << lo # bits lo .. hi-1
+            words[w] = words[w] | mask if value else words[w] & ~mask & WORD_MASK
+
+    # Whole sets O(n / 64)
+
+    def _as_int(self):
+        return int.from_bytes(self._words.tobytes(), 'little')
+
+    def _combine(self, other, value):
+        '''
+        value: the combined words as one int, written back as words
+        '''
+        res = Bitset(max(self._size, other._size))
+        res._words = array('Q', value.to_bytes(res.nbytes(), 'little'))
+        return res
+
+    def union(self, other):
+        return self._combine(other, self._as_int() | other._as_int())
+
+    def intersection(self, other):
+        return self._combine(other, self._as_int() & other._as_int())
+
+    def difference(self, other):
+        return self._combine(other, self._as_int() & ~other._as_int())
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    # Counting and iterating
+
+    def count(self): # O(n / 64), in C
+        return self._as_int().bit_count()
+
+    def rank(self, i): # O(i / 64)
+        '''
+        how many members are < i
+        '''
+        i = max(0, min(i, self._size))
+        w = i >> 6
+        res = int.from_bytes(self._words[:w].tobytes(), 'little').bit_count()
+        if i & 63:
+            res += clear_bits_from_msb(self._words[w], i & 63).bit_count()
+        return res
+
+    def select(self, k): # O(n / 64)
+        '''
+        the k-th smallest member (0-based)
+        '''
+        if k < 0:
+            raise IndexError("k must be >= 0")
+        for w, word in enumerate(self._words):
+            c = word.bit_count()
+            if k < c:
+                for _ in range(k):
+                    word &= word - 1 # drop the lowest set bit, k times
+                return (w << 6) + (word & -word).bit_length() - 1
+            k -= c
+        raise IndexError("select index out of range")
+
+    def __iter__(self): # O(n / 64 + members)
+        for w, word in enumerate(self._words):
+            base = w << 6
+            while word:
+                low = word & -word
+                yield base + low.bit_length() - 1
+                word ^= low
+
+
+if __name__ == "__main__":
+    import sys
+
+    a = Bitset(200, [1, 5, 64, 130, 199])
+    b = Bitset(200, range(0, 200, 5))
+    assert list(a & b) == [5, 130] and 64 in a - b and len(a | b) == 43
+    assert a.rank(130) == 3 and a.select(3) == 130
+
+    a.set_range(60, 70)
+    assert list(a) == [1, 5] + list(range(60, 70)) + [130, 199]
+    a.clear_range(0, 64)
+    assert list(a) == list(range(64, 70)) + [130, 199]
+
+    ids = range(0, 10_000_000, 7)
+    members = Bitset(10_000_000, ids)
+    print(f"{len(members)} ids: Bitset {members.nbytes()} B, set {sys.getsizeof(set(ids))} B (without the ints)")
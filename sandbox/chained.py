@@ -0,0 +1,190 @@
+'''
+Lazy concatenation
+
+[*list1, *list2] and {**dict1, **dict2} (unpackings.py) copy every element into a new list / dict.
+Joining batch after batch that way copies the first batch again on every join: O(n) per join, O(n^2) overall.
+The classes here keep the pieces as they are and only remember how they fit together:
+
+ChainedSequence: the segments, plus the index where each segment starts (prefix sums of the lengths)
+- append a segment: O(1), nothing is copied
+- chain + segment: O(1), a new chain that SHARES the segment list with the old one:
+  the lists only ever grow at the end, and every chain only looks at its first k entries,
+  so the old chain can't see the new segment. Only a chain that branches off a prefix (adding to an old chain
+  that was already extended) copies the k entries first. chain + chain is O(segments of the right one),
+  segment + chain (__radd__) is O(k): the new segment goes in front, every start index moves
+- chain[i]: binary search (bisect) for the segment holding i, O(log k) for k segments,
+  and O(1) when i is in the same segment as the last lookup (sequential access, i.e., merge, is the common case)
+- chain[a:b:c]: an ArrayView (views.py) over the chain, still nothing copied
+- materialize(): one list with everything, only when the caller really needs it
+
+LayeredMapping: the dicts as layers, a lookup checks them from the last to the first,
+so a key in a later layer wins, same as {**dict1, **dict2}
+
+NOTE:
+The segments and layers are not copied, so changes to them show through.
+A segment must not change its LENGTH after it's added, the start indexes would be wrong.
+'''
+from bisect import bisect_right
+from collections.abc import Mapping
+from itertools import chain
+
+from views import ArrayView
+
+
+class ChainedSequence:
+    __slots__ = ('_segments', '_starts', '_k', '_len', '_last')
+
+    def __init__(self, *segments):
+        self._segments, self._starts, self._k, self._len = [], [], 0, 0
+        self._last = 0 # the segment hit by the last lookup
+        for segment in segments:
+            self.append(segment)
+
+    def append(self, segment): # O(1), amortized over branching
+        if isinstance(segment, ChainedSequence): # flatten, so lookups stay one level deep
+            for s in segment._segments[:segment._k]: # a snapshot, segment may be self
+                self.append(s)
+            return
+        if not len(segment):
+            return
+        if self._k < len(self._segments): # the lists are shared with a longer chain: branch off
+            self._segments, self._starts = self._segments[:self._k], self._starts[:self._k]
+        self._segments.append(segment)
+        self._starts.append(self._len)
+        self._k += 1
+        self._len += len(segment)
+
+    def _share(self): # O(1)
+        res = ChainedSequence()
+        res._segments, res._starts, res._k, res._len = self._segments, self._starts, self._k, self._len
+        return res
+
+    def __add__(self, other): # O(1) for a segment, not O(n)
+        res = self._share()
+        res.append(other)
+        return res
+
+    def __radd__(self, other): # O(k)
+        return ChainedSequence(other, self)
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return f"ChainedSequence({', '.join(map(repr, self.segments))})"
+
+    def __iter__(self):
+        return chain.from_iterable(self._segments[:self._k])
+
+    def __eq__(self, other):
+        if not isinstance(other, (ChainedSequence, ArrayView, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def _locate(self, i): # O(log k), O(1) when i is in the same segment as last time
+        '''
+        returns (segment index, index inside that segment)
+        '''
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("ChainedSequence index out of range")
+        k, starts = self._last, self._starts
+        if not (starts[k] <= i and (k + 1 == self._k or i < starts[k + 1])):
+            k = self._last = bisect_right(starts, i, 0, self._k) - 1
+        return k, i - starts[k]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ArrayView(self, key.start, key.stop, key.step)
+        k, i = self._locate(key)
+        return self._segments[k][i]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            idx = range(self._len)[key]
+            values = list(value) # value may be a slice of this chain, read it all before writing
+            if len(values) != len(idx):
+                raise ValueError(f"a ChainedSequence slice can't change size: {len(idx)} slots, {len(values)} values")
+            for i, x in zip(idx, values):
+                k, j = self._locate(i)
+                self._segments[k][j] = x
+            return
+        k, i = self._locate(key)
+        self._segments[k][i] = value
+
+    @property
+    def segments(self):
+        return self._segments[:self._k]
+
+    def materialize(self): # O(n)
+        return list(self)
+
+
+class LayeredMapping(Mapping):
+    '''
+    read-only merge of mappings, LayeredMapping(d1, d2)[key] == {**d1, **d2}[key]
+    iteration order is also the same: keys in the order they first appear, layer by layer
+    '''
+    __slots__ = ('_layers',)
+
+    def __init__(self, *layers):
+        self._layers = list(layers)
+
+    def add_layer(self, layer): # O(1), the new layer wins over all the others
+        self._layers.append(layer)
+
+    def __getitem__(self, key): # O(layers)
+        for layer in reversed(self._layers):
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self):
+        seen = set()
+        for layer in self._layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return len(set().union(*self._layers))
+
+    def __repr__(self):
+        return f"LayeredMapping({', '.join(map(repr, self._layers))})"
+
+    def materialize(self): # O(n)
+        res = {}
+        for layer in self._layers:
+            res.update(layer)
+        return res
+
+
+if __name__ == "__main__":
+    from aymptotic_notation import merge
+    from sorting_algorithms import intro_sort, merge_sort
+
+    batches = ChainedSequence([5, 3], [9, 1, 7])
+    batches.append([2, 8])
+    assert batches[3] == 1 and batches[-1] == 8 and batches[1:6:2] == [3, 1, 2]
+
+    assert merge_sort(batches) == [1, 2, 3, 5, 7, 8, 9]
+    assert merge(ChainedSequence([1, 4], [6]), ChainedSequence([2], [3, 9])) == [1, 2, 3, 4, 6, 9]
+    intro_sort(batches) # in place, through the segments
+    assert batches.segments == [[1, 2], [3, 5, 7], [8, 9]]
+
+    more = batches + [10] # shares the segment list, batches itself doesn't change
+    other = batches + [0] # branches off: copies the 3 segments, more keeps its [10]
+    assert more[-1] == 10 and other[-1] == 0 and len(batches) == 7
+    assert [4] + batches == [4, 1, 2, 3, 5, 7, 8, 9]
+    batches.append(batches) # a snapshot of its own segments
+    assert batches.materialize() == [1, 2, 3, 5, 7, 8, 9] * 2
+
+    defaults, user = {'color': 'red', 'size': 1}, {'size': 3, 'name': 'x'}
+    settings = LayeredMapping(defaults, user)
+    assert dict(settings) == {**defaults, **user} == settings.materialize()
+    assert list(settings) == list({**defaults, **user})
@@ -0,0 +1,137 @@
+'''
+Empirical complexity fitting
+
+The docstrings in aymptotic_notation.py claim O(1), O(log n), ..., O(n!). This checks those claims by measurement:
+1. Run the algorithm on inputs of geometrically growing size n (i.e., 64, 128, ..., 4096)
+2. Measure the cost at every n: wall time, or an operation count from instrumentation.py (exact and noise-free)
+3. For every candidate class f(n), fit cost ~ c * f(n) by least squares, the class with the smallest error wins
+
+NOTE:
+The fit is done on logarithms: log(cost) = log(c) + log(f(n)).
+- c only shifts the curve, so the least squares c is just the mean of log(cost) - log(f(n))
+- what's left (the residual) measures how well the SHAPE of f matches, regardless of the constant
+- 2^n and n! overflow floats long before n gets big, their logs don't (log2(2^n) = n, log(n!) = lgamma(n + 1))
+'''
+import math
+import statistics
+import time
+from collections import namedtuple
+
+from instrumentation import instrument
+
+# (name, log f(n)), ordered from the slowest growing to the fastest
+CLASSES = [
+    ('O(1)', lambda n: 0.0),
+    ('O(log n)', lambda n: math.log(math.log2(n))),
+    ('O(n)', lambda n: math.log(n)),
+    ('O(n log n)', lambda n: math.log(n) + math.log(math.log2(n))),
+    ('O(n^2)', lambda n: 2 * math.log(n)),
+    ('O(2^n)', lambda n: n * math.log(2)),
+    ('O(n!)', lambda n: math.lgamma(n + 1)),
+]
+CLASS_NAMES = [name for name, _ in CLASSES]
+
+Fit = namedtuple('Fit', ['best', 'confidence', 'residuals', 'samples'])
+
+
+# Measuring
+
+def measure_time(func, make_input, sizes, repeats=5):
+    '''
+    returns [(n, median seconds)], make_input(n) is called before every run, outside the timing
+    '''
+    samples = []
+    for n in sizes:
+        times = []
+        for _ in range(repeats):
+            data = make_input(n)
+            start = time.perf_counter()
+            func(data)
+            times.append(time.perf_counter() - start)
+        samples.append((n, statistics.median(times)))
+    return samples
+
+def measure_ops(func, make_input, sizes, metric='comparisons'):
+    '''
+    returns [(n, count)], counted with instrumentation.py, metric is any Stats field ('comparisons', 'moves', ...)
+    '''
+    samples = []
+    for n in sizes:
+        data = make_input(n)
+        with instrument() as stats:
+            func(stats.track(data))
+        samples.append((n, getattr(stats, metric)))
+    return samples
+
+
+# Fitting
+
+def fit(samples, classes=CLASSES):
+    '''
+    samples: [(n, cost)], n >= 2 and cost >= 0
+    returns Fit(best class name, confidence in [0, 1], {class name: residual}, samples)
+    confidence is how much better the best class fits than the runner-up (0 = a tie, 1 = a perfect fit)
+    a cost that doesn't change with n (even 0, i.e., nothing counted at all) is O(1) outright,
+    log(0) can't be fitted, and no growing class can match a flat line anyway
+    '''
+    points = [(n, cost) for n, cost in samples if n >= 2]
+    costs = {cost for _, cost in points}
+    if len(points) >= 3 and len(costs) == 1:
+        residuals = {name: 0.0 if name == 'O(1)' else math.inf for name, _ in classes}
+        return Fit('O(1)', 1.0, residuals, points)
+    points = [(n, cost) for n, cost in points if cost > 0]
+    if len(points) < 3:
+        raise ValueError("need at least 3 sizes (n >= 2) with a non-zero cost")
+    residuals = {}
+    for name, log_f in classes:
+        diffs = [math.log(cost) - log_f(n) for n, cost in points]
+        log_c = statistics.fmean(diffs)
+        residuals[name] = math.sqrt(statistics.fmean([(d - log_c) ** 2 for d in diffs]))
+    ranked = sorted(residuals, key=residuals.get)
+    best, runner_up = residuals[ranked[0]], residuals[ranked[1]]
+    confidence = 1.0 - best / runner_up if runner_up > 0 else 0.0
+    return Fit(ranked[0], confidence, residuals, points)
+
+def check_complexity(func, make_input, expected, sizes=None, measure='ops', repeats=5):
+    '''
+    the regression gate: fails (AssertionError) when func grows FASTER than the expected class
+    i.e., check_complexity(lambda a: quick_sort(a, 0, len(a)-1), lambda n: list(range(n)), 'O(n log n)')
+    fails, because on sorted input that quick_sort is quadratic
+    '''
+    if expected not in CLASS_NAMES:
+        raise ValueError(f"unknown class {expected!r}, pick one of {CLASS_NAMES}")
+    sizes = sizes or [2**k for k in range(6, 12)]
+    if measure == 'ops':
+        samples = measure_ops(func, make_input, sizes)
+    elif measure == 'time':
+        samples = measure_time(func, make_input, sizes, repeats)
+    else:
+        raise ValueError("measure must be 'ops' or 'time'")
+    result = fit(samples)
+    if CLASS_NAMES.index(result.best) > CLASS_NAMES.index(expected):
+        raise AssertionError(
+            f"expected {expected}, measured {result.best} (confidence {result.confidence:.2f}): {result.samples}"
+        )
+    return result
+
+
+if __name__ == "__main__":
+    import random
+
+    import aymptotic_notation
+    import sorting_algorithms
+
+    shuffled = lambda n: random.sample(range(n), n)
+    ascending = lambda n: list(range(n))
+
+    print(check_complexity(sorting_algorithms.intro_sort, ascending, 'O(n log n)').best)
+    print(check_complexity(aymptotic_notation.merge_sort, shuffled, 'O(n log n)').best)
+    print(check_complexity(aymptotic_notation.insertion_sort, shuffled, 'O(n^2)', sizes=[2**k for k in range(5, 10)]).best)
+    print(check_complexity(aymptotic_notation.find_max, shuffled, 'O(n)', measure='time').best)
+    print(check_complexity(lambda a: a[0], shuffled, 'O(1)').best) # no comparisons at all
+
+    try: # quick_sort picks arr[low] as the pivot, so sorted input is its worst case
+        check_complexity(lambda a: aymptotic_notation.quick_sort(a, 0, len(a) - 1), ascending, 'O(n log n)',
+                         sizes=[2**k for k in range(5, 10)])
+    except AssertionError as e:
+        print("quick_sort on sorted input:", str(e).split(':')[0])
@@ -0,0 +1,185 @@
+'''
+External (out-of-core) sort
+
+When the data does not fit in memory, sort it in two phases:
+1. Run generation: read a chunk that fits in the memory budget, sort it in memory (natural_merge_sort),
+   write it out as a sorted "run" to a temporary file. Repeat until the input is consumed.
+2. Merging: stream all the runs through a k-way merge (sorting_algorithms.merge_k) into the output file,
+   each run is read through a small buffer, so only k buffers are in memory at once.
+   If there are more runs than fan_in, merge them in groups first (multi-pass merge).
+
+Two input formats:
+- text:   one record per line, key turns a line into what it's sorted by (int by default, None compares the lines).
+          The lines themselves are what goes into the runs and the output, unchanged, in key order (stable).
+- binary: fixed-width numbers, same typecodes as the array module ('q', 'd', ...).
+          The input is memory-mapped, so a chunk is just a window into the file, not a read() into a bytes copy.
+
+NOTE:
+memory_limit is a budget for the Python objects being sorted, not an exact cap.
+A Python int inside a list (plus its slot in the merge buffer) costs ~ITEM_COST bytes, not 8.
+'''
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+
+from sorting_algorithms import merge_k, natural_merge_sort
+
+ITEM_COST = 64 # rough bytes per value while a chunk is being sorted (object + list slot + merge buffer slot)
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 64
+
+
+def external_sort(in_path, out_path, memory_limit=DEFAULT_MEMORY_LIMIT, binary=False, typecode='q', key=int,
+                  fan_in=DEFAULT_FAN_IN, tmp_dir=None):
+    '''
+    sorts the file at in_path into out_path, using roughly memory_limit bytes
+    '''
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        if binary:
+            runs = _binary_runs(in_path, tmp, memory_limit, typecode)
+        else:
+            runs = _text_runs(in_path, tmp, memory_limit, key)
+
+        while len(runs) > fan_in:
+            runs = [
+                _merge_runs(runs[i:i + fan_in], _run_path(tmp, f"m{len(runs)}_{i}"),
+                            memory_limit, binary, typecode, key)
+                for i in range(0, len(runs), fan_in)
+            ]
+        _merge_runs(runs, out_path, memory_limit, binary, typecode, key)
+
+
+# Run generation
+
+def _run_path(tmp, name):
+    return os.path.join(tmp, f"run_{name}")
+
+def _binary_runs(in_path, tmp, memory_limit, typecode):
+    itemsize = array(typecode).itemsize
+    chunk_items = max(1, memory_limit // ITEM_COST)
+    runs = []
+    with open(in_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % itemsize:
+            raise ValueError(f"{in_path} is not a whole number of {itemsize}-byte items")
+        if not size:
+            return runs
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm).cast(typecode)
+            try:
+                for lo in range(0, len(view), chunk_items):
+                    chunk = view[lo:lo + chunk_items].tolist()
+                    natural_merge_sort(chunk)
+                    runs.append(_write_binary_run(_run_path(tmp, len(runs)), chunk, typecode))
+                    del chunk
+            finally: # the mmap can't close while the view is exported, that error would hide the real one
+                view.release()
+    return runs
+
+def _write_binary_run(path, values, typecode):
+    with open(path, 'wb') as f:
+        array(typecode, values).tofile(f)
+    return path
+
+def _text_runs(in_path, tmp, memory_limit, key):
+    runs = []
+    chunk, used = [], 0
+    with open(in_path) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            chunk.append(line)
+            used += sys.getsizeof(line) + ITEM_COST # the line, plus its key while sorting
+            if used >= memory_limit:
+                runs.append(_write_text_run(_run_path(tmp, len(runs)), chunk, key))
+                chunk, used = [], 0
+    if chunk:
+        runs.append(_write_text_run(_run_path(tmp, len(runs)), chunk, key))
+    return runs
+
+def _write_text_run(path, lines, key):
+    natural_merge_sort(lines, key=key)
+    with open(path, 'w') as f:
+        f.writelines(f"{line}\n" for line in lines)
+    return path
+
+
+# Merging
+
+def _merge_runs(runs, out_path, memory_limit, binary, typecode, key):
+    # each open run (and the output) gets an equal share of the budget as its buffer
+    buffer_bytes = max(4096, memory_limit // (len(runs) + 1))
+    if binary:
+        readers = [_read_binary_run(path, typecode, buffer_bytes) for path in runs]
+        _write_binary(out_path, merge_k(readers), typecode, buffer_bytes)
+    else:
+        readers = [_read_text_run(path, buffer_bytes) for path in runs]
+        with open(out_path, 'w', buffering=buffer_bytes) as out:
+            out.writelines(f"{line}\n" for line in merge_k(readers, key=key))
+    for path in runs:
+        if path != out_path:
+            os.remove(path)
+    return out_path
+
+def _read_binary_run(path, typecode, buffer_bytes):
+    block_items = max(1, buffer_bytes // ITEM_COST)
+    with open(path, 'rb') as f:
+        while True:
+            block = array(typecode)
+            try:
+                block.fromfile(f, block_items)
+            except EOFError: # fewer than block_items left, the rest is still read into block
+                pass
+            if not block:
+                return
+            yield from block
+
+def _read_text_run(path, buffer_bytes):
+    with open(path, buffering=buffer_bytes) as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+def _write_binary(out_path, values, typecode, buffer_bytes):
+    block_items = max(1, buffer_bytes // ITEM_COST)
+    with open(out_path, 'wb') as f:
+        block = array(typecode)
+        for x in values:
+            block.append(x)
+            if len(block) >= block_items:
+                block.tofile(f)
+                block = array(typecode)
+        block.tofile(f)
+
+
+if __name__ == "__main__":
+    import random
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "in.bin"), os.path.join(tmp, "out.bin")
+        lst = [random.randint(-2**63, 2**63 - 1) for _ in range(100_000)]
+        with open(src, 'wb') as f:
+            array('q', lst).tofile(f)
+
+        external_sort(src, dst, memory_limit=64 * 1024, binary=True, fan_in=8) # ~1k items per run, so a multi-pass merge
+        res = array('q')
+        with open(dst, 'rb') as f:
+            res.frombytes(f.read())
+        assert res.tolist() == sorted(lst)
+
+        src, dst = os.path.join(tmp, "in.txt"), os.path.join(tmp, "out.txt")
+        with open(src, 'w') as f:
+            f.writelines(f"{x}\n" for x in lst)
+        external_sort(src, dst, memory_limit=256 * 1024)
+        with open(dst) as f:
+            assert [int(line) for line in f] == sorted(lst)
+
+        # records sorted by their first field, written back as they were
+        with open(src, 'w') as f:
+            f.writelines(f"{x % 100},{i:.1e}\n" for i, x in enumerate(lst))
+        external_sort(src, dst, memory_limit=256 * 1024, key=lambda line: int(line.split(',')[0]))
+        with open(src) as f, open(dst) as g:
+            assert g.read().splitlines() == sorted(f.read().splitlines(), key=lambda line: int(line.split(',')[0]))
+        print("ok")
@@ -0,0 +1,246 @@
+'''
+Operation counting
+
+When a sort is slow, the question is WHY: too many comparisons, too many element moves, or too many temporary lists?
+This counts, for any algorithm in the sandbox, without touching the algorithm's code:
+- comparisons:     the elements are wrapped (Tracked), so every <, <=, >, >=, ==, != between two of them is counted
+- moves:           the list is a TrackedList, every element written into it is counted (arr[i] = x, slice assignment),
+                   plus every list.append / insert made while instrumenting (i.e., _merge building res)
+- allocations:     every slice or copy() taken from a TrackedList (merge_sort's arr[:mid]) is counted,
+                   with the items it copies
+- max_depth:       deepest Python call stack reached below the 'with' block (recursion depth)
+- peak_bytes:      peak memory traced by tracemalloc while instrumenting
+
+usage:
+    with instrument() as stats:
+        data = stats.track([8, 2, 1, 6, 7])
+        merge_sort(data)
+    print(stats)
+
+Arithmetic and bitwise operators on a Tracked (x - lo, x & mask, abs(x), -x) give a Tracked back,
+so counting_sort / radix_sort and keys like key=abs work, and comparing the results is still counted.
+int(), float(), bool() and index() give the plain value, so a Tracked int can index a list.
+
+NOTE:
+It costs nothing when it's off: the algorithms never check a flag, the counting lives entirely in the wrappers
+and in a profile hook (sys.setprofile), and both only exist inside the 'with' block.
+What it can't see:
+- writes into a plain list the algorithm builds itself (dst[k] = x on a list from [0] * n or a comprehension),
+  only TrackedLists and their copies count element writes (append / insert count on every list)
+- allocations of plain lists (list(arr), comprehensions, [0] * n), only slices and copies of a TrackedList
+- checks on the exact type (type(x) is int), a Tracked is not an int
+- work done inside C (sorted(), the NumPy paths) other than the comparisons it makes
+'''
+import operator
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from numbers import Number
+
+_stats = None # the Stats being filled, only set inside instrument()
+
+
+class Stats:
+    __slots__ = ('comparisons', 'moves', 'allocations', 'allocated_items', 'max_depth', 'peak_bytes')
+
+    def __init__(self):
+        self.comparisons = self.moves = self.allocations = self.allocated_items = 0
+        self.max_depth = self.peak_bytes = 0
+
+    def __repr__(self):
+        return "Stats(" + ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__) + ")"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def track(self, iterable):
+        '''
+        wraps every element, returns a TrackedList to hand to the algorithm
+        '''
+        return TrackedList(Tracked(x) for x in iterable)
+
+
+class Tracked:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return repr(self.value)
+
+    def __lt__(self, other):
+        _count_comparison()
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        _count_comparison()
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        _count_comparison()
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        _count_comparison()
+        return self.value >= _value(other)
+
+    def __eq__(self, other):
+        _count_comparison()
+        return self.value == _value(other)
+
+    def __ne__(self, other):
+        _count_comparison()
+        return self.value != _value(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __int__(self):
+        return int(self.value)
+
+    def __float__(self):
+        return float(self.value)
+
+    def __index__(self):
+        return operator.index(self.value)
+
+def _binary_op(op):
+    '''
+    only with numbers: [0] * Tracked(5) must stay list repetition (through __index__), not become a Tracked list
+    '''
+    def method(self, other):
+        if not isinstance(other, (Tracked, Number)):
+            return NotImplemented
+        return Tracked(op(self.value, _value(other)))
+    def reflected(self, other):
+        if not isinstance(other, Number):
+            return NotImplemented
+        return Tracked(op(other, self.value))
+    return method, reflected
+
+def _unary_op(op):
+    def method(self):
+        return Tracked(op(self.value))
+    return method
+
+for _name in ('add', 'sub', 'mul', 'truediv', 'floordiv', 'mod', 'pow', 'lshift', 'rshift', 'and', 'or', 'xor'):
+    _method, _reflected = _binary_op(getattr(operator, _name + '_' if _name in ('and', 'or') else _name))
+    setattr(Tracked, f'__{_name}__', _method)
+    setattr(Tracked, f'__r{_name}__', _reflected)
+for _name in ('neg', 'pos', 'abs', 'invert'):
+    setattr(Tracked, f'__{_name}__', _unary_op(getattr(operator, _name)))
+
+def _value(x):
+    return x.value if type(x) is Tracked else x
+
+def _count_comparison():
+    if _stats is not None:
+        _stats.comparisons += 1
+
+def untrack(iterable):
+    return [_value(x) for x in iterable]
+
+
+class TrackedList(list):
+    __slots__ = ()
+
+    def __getitem__(self, idx):
+        if type(idx) is slice:
+            res = TrackedList(list.__getitem__(self, idx))
+            if _stats is not None:
+                _stats.allocations += 1
+                _stats.allocated_items += len(res)
+            return res
+        return list.__getitem__(self, idx)
+
+    def __setitem__(self, idx, value):
+        if type(idx) is slice:
+            value = list(value)
+            if _stats is not None:
+                _stats.moves += len(value)
+        elif _stats is not None:
+            _stats.moves += 1
+        list.__setitem__(self, idx, value)
+
+    def copy(self):
+        return self[:]
+
+
+def _profile(frame, event, arg):
+    stats = _stats
+    if stats is None:
+        return
+    if event == 'call':
+        if frame.f_code.co_filename != __file__:
+            depth = _stack_depth(frame) - _profile.base_depth
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+    elif event == 'c_call' and isinstance(getattr(arg, '__self__', None), list): # TrackedList too
+        if arg.__name__ in ('append', 'insert'):
+            stats.moves += 1
+
+def _stack_depth(frame):
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+@contextmanager
+def instrument():
+    global _stats
+    if _stats is not None:
+        raise RuntimeError("instrument() is already active")
+    stats = _stats = Stats()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_bytes, _ = tracemalloc.get_traced_memory()
+    _profile.base_depth = _stack_depth(sys._getframe(2)) # the frame running the 'with' body (0: here, 1: __enter__)
+    previous_profile = sys.getprofile()
+    sys.setprofile(_profile)
+    try:
+        yield stats
+    finally:
+        sys.setprofile(previous_profile)
+        _, peak = tracemalloc.get_traced_memory()
+        stats.peak_bytes = max(0, peak - start_bytes)
+        if not was_tracing:
+            tracemalloc.stop()
+        _stats = None
+
+def profile(func, data, *args):
+    '''
+    runs func(tracked data, *args) under instrument(), returns (result, stats)
+    '''
+    with instrument() as stats:
+        tracked = stats.track(data)
+        res = func(tracked, *args)
+    return res, stats
+
+
+if __name__ == "__main__":
+    import random
+
+    import sorting_algorithms
+
+    lst = random.sample(range(1000), 1000)
+    for name, run in [
+        ('merge_sort', lambda a: sorting_algorithms.merge_sort(a)),
+        ('natural_merge_sort', lambda a: sorting_algorithms.natural_merge_sort(a)),
+        ('quick_sort', lambda a: sorting_algorithms.quick_sort(a, 0, len(a) - 1)),
+        ('intro_sort', lambda a: sorting_algorithms.intro_sort(a)),
+        ('heap_sort', lambda a: sorting_algorithms.heap_sort(a)),
+        ('insertion_sort', lambda a: sorting_algorithms.insertion_sort(a)),
+        ('radix_sort', lambda a: sorting_algorithms.radix_sort(a)),
+        ('auto_sort', lambda a: sorting_algorithms.auto_sort(a)),
+        ('intro_sort key=abs', lambda a: sorting_algorithms.intro_sort(a, key=abs)),
+    ]:
+        _, stats = profile(run, lst)
+        print(f"{name:20}", stats)
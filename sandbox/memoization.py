@@ -0,0 +1,210 @@
+'''
+Memoization
+
+Store the result of a call, return the stored result when the function is called with the same arguments again.
+For a pure function it changes nothing but the running time, i.e., fibonacci goes from O(2^n) calls to O(n).
+
+functools.lru_cache does this too, memoize adds what it's missing:
+- policy: which entry to throw out when the cache is full
+    'lru': least recently used, good when recent calls are likely to repeat
+    'lfu': least frequently used, good when a few hot arguments are called over and over
+- ttl: seconds an entry stays valid, for functions whose answer goes stale (i.e., a lookup in a file that changes)
+- stats: hits, misses and evictions, to see if the cache actually helps (cache_info())
+
+usage:
+    @memoize                                  # unbounded
+    @memoize(maxsize=1024, policy='lfu', ttl=60)
+
+NOTE:
+Both policies are O(1) per call:
+- LRU is an OrderedDict, a hit moves the key to the end, the oldest key is at the front
+- LFU keeps one OrderedDict of keys per use count (a 'bucket'), plus the smallest count that has keys.
+  A hit moves the key to the next bucket, eviction takes the oldest key of the smallest bucket,
+  so ties between equally used keys fall back to LRU
+'''
+import functools
+import time
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+_MISSING = object() # a cached value can be None, so None can't mean "not cached"
+
+
+class _LRUCache:
+    __slots__ = ('maxsize', '_entries')
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict() # key -> (value, expires)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[1] is not None and entry[1] <= now:
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, expires):
+        '''
+        returns how many entries were evicted to make room
+        '''
+        entries = self._entries
+        entries[key] = (value, expires)
+        entries.move_to_end(key)
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            return 1
+        return 0
+
+    def clear(self):
+        self._entries.clear()
+
+
+class _LFUCache:
+    __slots__ = ('maxsize', '_entries', '_buckets', '_min_count')
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = {} # key -> [value, expires, count]
+        self._buckets = {} # count -> OrderedDict of the keys used that many times, oldest first
+        self._min_count = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[1] is not None and entry[1] <= now:
+            self._remove(key)
+            return _MISSING
+        self._touch(key, entry)
+        return entry[0]
+
+    def put(self, key, value, expires):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0], entry[1] = value, expires
+            self._touch(key, entry)
+            return 0
+        evicted = 0
+        if self.maxsize is not None and len(self._entries) >= self.maxsize:
+            bucket = self._buckets[self._min_count]
+            self._remove(next(iter(bucket)))
+            evicted = 1
+        self._entries[key] = [value, expires, 1]
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+        return evicted
+
+    def clear(self):
+        self._entries.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+    def _touch(self, key, entry):
+        count = entry[2]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        entry[2] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _remove(self, key):
+        count = self._entries.pop(key)[2]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = min(self._buckets, default=0)
+
+
+POLICIES = {'lru': _LRUCache, 'lfu': _LFUCache}
+
+
+def _make_key(args, kwargs):
+    if not kwargs:
+        return args[0] if len(args) == 1 and type(args[0]) in (int, str) else args
+    return args + (_MISSING,) + tuple(sorted(kwargs.items()))
+
+def memoize(func=None, *, maxsize=None, policy='lru', ttl=None):
+    '''
+    maxsize=None: unbounded (nothing is ever evicted), maxsize=0: nothing is cached, only counted
+    the arguments must be hashable
+    '''
+    if policy not in POLICIES:
+        raise ValueError(f"policy must be one of {list(POLICIES)}")
+    if maxsize is not None and maxsize < 0:
+        raise ValueError("maxsize must be >= 0 or None")
+
+    def decorate(func):
+        cache = POLICIES[policy](maxsize)
+        stats = [0, 0, 0] # hits, misses, evictions
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            now = time.monotonic() if ttl is not None else None
+            value = cache.get(key, now)
+            if value is not _MISSING:
+                stats[0] += 1
+                return value
+            stats[1] += 1
+            value = func(*args, **kwargs)
+            if maxsize != 0:
+                stats[2] += cache.put(key, value, None if ttl is None else time.monotonic() + ttl)
+            return value
+
+        def cache_info():
+            return CacheInfo(stats[0], stats[1], stats[2], maxsize, len(cache))
+
+        def cache_clear():
+            cache.clear()
+            stats[:] = [0, 0, 0]
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    if func is not None: # used bare: @memoize
+        return decorate(func)
+    return decorate
+
+
+if __name__ == "__main__":
+    @memoize(maxsize=2)
+    def square(x):
+        return x * x
+
+    square(1), square(2), square(1), square(3) # 3 evicts 2, the least recently used
+    assert square.cache_info() == CacheInfo(hits=1, misses=3, evictions=1, maxsize=2, currsize=2)
+
+    @memoize(maxsize=2, policy='lfu')
+    def cube(x):
+        return x ** 3
+
+    cube(1), cube(1), cube(2), cube(3) # 3 evicts 2, the least frequently used
+    cube(1)
+    assert cube.cache_info().hits == 2
+
+    @memoize(ttl=0.01)
+    def now(tag):
+        return time.monotonic()
+
+    first = now('a')
+    assert now('a') == first
+    time.sleep(0.02)
+    assert now('a') != first
+    print(square.cache_info(), cube.cache_info(), now.cache_info())
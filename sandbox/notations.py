@@ -12,4 +12,15 @@ def test_slice_notation():
     arr[::2] # every 2nd element
     arr[1::2] # every 2nd, starting at 1
     arr[::-1] # reverse
-    arr[::3] # every 3rd element
\ No newline at end of file
+    arr[::3] # every 3rd element
+
+def test_slice_views():
+    # every slice above copies, an ArrayView (views.py) reads the same positions from arr without copying
+    from views import ArrayView
+
+    arr = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    view = ArrayView(arr)
+    view[2:5] # a window on index 2 to 4
+    view[::-1] # reversed, still over arr
+    view[::-1][::2] # views nest: every 2nd element of the reversed view
+    view[-3:][0] = 70 # writes go through: arr[7] is now 70
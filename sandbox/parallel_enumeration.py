@@ -0,0 +1,161 @@
+'''
+Parallel enumeration of 2^n and n! search spaces
+
+Brute force over all permutations or all subsets is embarrassingly parallel: every candidate is checked on its own.
+The only question is how to hand the candidates out without building them in the parent. Both spaces are indexed:
+- subsets:      mask 0 .. 2^n - 1, the bits of the mask say which items are in (see get_all_subsets)
+- permutations: rank 0 .. n! - 1, nth_permutation(items, rank) jumps straight to any of them (permutations.py)
+so a shard is just a range [start, stop), and a worker rebuilds its candidates from the range by itself.
+Only the range goes to the worker and only the matches (or one reduced value) come back.
+
+Two modes:
+- parallel_search: yields every candidate the predicate accepts, streaming, shard by shard as they finish
+                   first=True stops everything at the first match: the worker that finds it sets a shared Event,
+                   and every worker checks that Event while scanning, so the rest of the space is skipped
+- parallel_reduce: folds func(candidate) with reducer inside every shard, then folds the shard results together
+                   (reducer must be associative and initial its identity, i.e., operator.add and 0)
+
+NOTE:
+predicate/func/reducer are pickled to the workers, so they must be module-level functions, not lambdas.
+There are several shards per worker, so a worker that gets an easy shard picks up another one instead of idling.
+'''
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import reduce
+from itertools import islice
+from multiprocessing import get_context
+
+from bit_manipulation import mask_to_subset
+from permutations import count_permutations, lexicographic_permutations
+
+PARALLEL_MIN_SIZE = 50_000 # below this many candidates, starting the processes costs more than it saves
+SHARDS_PER_WORKER = 8
+CHECK_EVERY = 1024         # candidates between two looks at the stop Event
+
+_stop = None # the Event shared with the workers, set by _init_worker
+
+
+def space_size(items, space):
+    if space == 'subsets':
+        return 1 << len(items)
+    if space == 'permutations':
+        return count_permutations(items)
+    raise ValueError("space must be 'permutations' or 'subsets'")
+
+def make_shards(total, shards):
+    '''
+    splits [0, total) into (start, stop) ranges of (almost) equal size
+    '''
+    shards = max(1, min(shards, total))
+    bounds = [total * i // shards for i in range(shards + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+def iter_shard(items, space, start, stop):
+    '''
+    the candidates with index start .. stop-1: permutations (tuples, in sorted order) or subsets (lists)
+    '''
+    if space == 'permutations':
+        return islice(lexicographic_permutations(items, start=start), stop - start)
+    return (mask_to_subset(items, mask) for mask in range(start, stop))
+
+
+# Workers
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+def _search_shard(items, space, start, stop, predicate, first):
+    matches = []
+    for i, candidate in enumerate(iter_shard(items, space, start, stop)):
+        if i % CHECK_EVERY == 0 and _stop.is_set():
+            break
+        if predicate(candidate):
+            matches.append(candidate)
+            if first:
+                _stop.set()
+                break
+    return matches
+
+def _reduce_shard(items, space, start, stop, func, reducer, initial):
+    return reduce(reducer, map(func, iter_shard(items, space, start, stop)), initial)
+
+
+def _run_shards(task, items, space, args, workers, shards):
+    '''
+    yields task's result for every shard, in the order they finish
+    closing the generator (i.e., the caller breaks out of its loop) stops the workers that are still scanning
+    '''
+    global _stop
+    items = list(items)
+    total = space_size(items, space)
+    workers = workers or os.cpu_count() or 1
+    ranges = make_shards(total, shards or workers * SHARDS_PER_WORKER)
+
+    if workers == 1 or total < PARALLEL_MIN_SIZE:
+        previous, _stop = _stop, threading.Event()
+        try:
+            for start, stop in ranges:
+                yield task(items, space, start, stop, *args)
+        finally:
+            _stop = previous
+        return
+
+    ctx = get_context()
+    stop_event = ctx.Event()
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker, initargs=(stop_event,)) as pool:
+        pending = {pool.submit(task, items, space, start, stop, *args) for start, stop in ranges}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result() # once the stop Event is set, the remaining shards come back empty, fast
+        finally:
+            stop_event.set()
+            for future in pending:
+                future.cancel()
+
+
+def parallel_search(items, predicate, space='permutations', first=False, workers=None, shards=None):
+    '''
+    yields every permutation (tuple) or subset (list) of items for which predicate(candidate) is true
+    first=True: stop at the first match found (not necessarily the first in sorted order)
+    '''
+    for matches in _run_shards(_search_shard, items, space, (predicate, first), workers, shards):
+        yield from matches
+        if first and matches:
+            return
+
+def parallel_reduce(items, func, reducer, initial, space='permutations', workers=None, shards=None):
+    '''
+    reducer(... reducer(reducer(initial, func(c1)), func(c2)) ..., func(cN)) over every candidate, in any grouping
+    '''
+    return reduce(reducer, _run_shards(_reduce_shard, items, space, (func, reducer, initial), workers, shards), initial)
+
+
+def _is_sorted_desc(perm):
+    return all(a > b for a, b in zip(perm, perm[1:]))
+
+def _sums_to_100(subset):
+    return sum(subset) == 100
+
+def _count(candidate):
+    return 1
+
+def _add(a, b):
+    return a + b
+
+
+if __name__ == "__main__":
+    import time
+
+    items = list(range(9)) # 362880 permutations
+    start = time.perf_counter()
+    print(next(parallel_search(items, _is_sorted_desc, first=True)), round(time.perf_counter() - start, 3), "s")
+    assert parallel_reduce(items, _count, _add, 0) == 362_880
+
+    weights = [3, 5, 8, 13, 21, 34, 55, 89, 12, 7, 40, 60, 25, 9, 18, 30] # 65536 subsets
+    found = list(parallel_search(weights, _sums_to_100, space='subsets'))
+    assert all(sum(s) == 100 for s in found)
+    print(len(found), "subsets sum to 100")
@@ -0,0 +1,169 @@
+'''
+Parallel merge sort
+
+Merge sort splits naturally: the halves are independent until the final merge.
+Here the input is cut into one chunk per worker, instead of halves:
+1. The numbers are copied ONCE into a shared memory block (multiprocessing.shared_memory).
+   The block holds two copies of the array, every merge round reads from one half and writes into the other.
+2. Each worker process attaches to that block by name and sorts its own chunk in place,
+   so nothing is pickled back and forth except the block name and the bounds.
+3. The sorted chunks are merged pairwise, round after round, and the merges run in the workers too.
+   A merge of two long runs would keep only one worker busy, so every merge is cut into pieces (merge path):
+   output positions out_lo .. out_hi of merging A and B take A[i:i2] and B[out_lo-i:out_hi-i2],
+   where i (the co-rank of out_lo) is found by binary search, and each piece is merged on its own.
+   Every round is n elements split evenly over the workers, and there are log2(workers) rounds.
+
+NOTE:
+Shared memory is a flat run of bytes, so this only works for fixed-width numbers ('q' 64-bit ints, 'd' floats),
+the same typecodes the array module uses. By default the typecode is picked from the data: 'd' if any float.
+'''
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+from sorting_algorithms import _merge_runs, natural_merge_sort
+
+PARALLEL_MIN_SIZE = 100_000 # below this, starting the processes costs more than it saves
+
+
+def parallel_merge_sort(arr, workers=None, typecode=None): # O(n log n / workers)
+    '''
+    returns a new sorted list, like merge_sort
+    '''
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    data = _typed(arr, typecode) # also for small inputs, so a bad typecode fails at every size
+    if workers == 1 or n < PARALLEL_MIN_SIZE:
+        return natural_merge_sort(list(arr))
+
+    typecode = data.typecode
+    shm = shared_memory.SharedMemory(create=True, size=2 * n * data.itemsize)
+    try:
+        try:
+            with _shared_view(shm, typecode) as view:
+                view[:n] = data
+            del data
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                src = _sort_and_merge(pool, shm.name, typecode, n, workers)
+            with _shared_view(shm, typecode) as view:
+                return view[src:src + n].tolist()
+        finally:
+            shm.close()
+    finally:
+        shm.unlink()
+
+def _typed(arr, typecode):
+    if typecode is not None:
+        return array(typecode, arr)
+    try:
+        return array('q', arr)
+    except TypeError: # floats in it
+        return array('d', arr)
+
+@contextmanager
+def _shared_view(shm, typecode):
+    '''
+    the block as typed values, released even on errors: shm.close() fails while a view is still exported
+    '''
+    view = shm.buf.cast(typecode)
+    try:
+        yield view
+    finally:
+        view.release()
+
+def _sort_and_merge(pool, name, typecode, n, workers):
+    '''
+    runs in the parent, only hands out bounds: returns the offset (0 or n) of the half holding the result
+    '''
+    runs = [n * i // workers for i in range(workers + 1)]
+    _run_all(pool, [(_sort_shared_chunk, name, typecode, lo, hi) for lo, hi in zip(runs, runs[1:])])
+
+    src, dst = 0, n
+    while len(runs) > 2:
+        tasks, merged = [], [0]
+        for r in range(0, len(runs) - 1, 2):
+            lo, mid = runs[r], runs[r + 1]
+            hi = runs[r + 2] if r + 2 < len(runs) else mid # odd run out: merged with nothing, i.e., copied
+            pieces = max(1, round(workers * (hi - lo) / n))
+            cuts = [(hi - lo) * p // pieces for p in range(pieces + 1)]
+            for out_lo, out_hi in zip(cuts, cuts[1:]):
+                tasks.append((_merge_shared_piece, name, typecode, src, dst, lo, mid, hi, out_lo, out_hi))
+            merged.append(hi)
+        _run_all(pool, tasks)
+        runs = merged
+        src, dst = dst, src
+    return src
+
+def _run_all(pool, tasks):
+    futures = [pool.submit(*task) for task in tasks]
+    wait(futures)
+    for f in futures:
+        f.result() # raises the first worker error, if any
+
+@contextmanager
+def _attach(name, typecode):
+    '''
+    runs in a worker: the block by name, as typed values
+    '''
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with _shared_view(shm, typecode) as view:
+            yield view
+    finally:
+        shm.close()
+
+def _sort_shared_chunk(name, typecode, lo, hi):
+    '''
+    runs in a worker: sort view[lo:hi] in place
+    '''
+    with _attach(name, typecode) as view:
+        chunk = view[lo:hi].tolist()
+        natural_merge_sort(chunk)
+        view[lo:hi] = array(typecode, chunk)
+
+def _merge_shared_piece(name, typecode, src, dst, lo, mid, hi, out_lo, out_hi):
+    '''
+    runs in a worker: output positions out_lo .. out_hi-1 of merging the runs [lo, mid) and [mid, hi) of the src half,
+    written to the same positions of the dst half
+    '''
+    with _attach(name, typecode) as view:
+        a_lo, a_hi, b_lo, b_hi = src + lo, src + mid, src + mid, src + hi
+        i, i2 = _co_rank(view, out_lo, a_lo, a_hi, b_lo, b_hi), _co_rank(view, out_hi, a_lo, a_hi, b_lo, b_hi)
+        left = view[a_lo + i:a_lo + i2].tolist()
+        right = view[b_lo + out_lo - i:b_lo + out_hi - i2].tolist()
+        merged = left + right
+        if left and right:
+            runs = merged
+            merged = [0] * len(runs)
+            _merge_runs(runs, merged, 0, len(left), len(runs))
+        view[dst + lo + out_lo:dst + lo + out_hi] = array(typecode, merged)
+
+def _co_rank(view, k, a_lo, a_hi, b_lo, b_hi): # O(log n)
+    '''
+    how many of the first k merged values come from A = view[a_lo:a_hi] (B = view[b_lo:b_hi])
+    ties go to A, same as a stable merge: the smallest i with A[i] > B[k-i-1]
+    '''
+    lo, hi = max(0, k - (b_hi - b_lo)), min(k, a_hi - a_lo)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if view[a_lo + i] <= view[b_lo + k - i - 1]:
+            lo = i + 1
+        else:
+            hi = i
+    return lo
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    lst = [random.randint(-10**9, 10**9) for _ in range(1_000_000)]
+    for workers in (1, 2, 4):
+        start = time.perf_counter()
+        res = parallel_merge_sort(lst, workers)
+        print(workers, "workers:", round(time.perf_counter() - start, 3), "s")
+    assert res == sorted(lst)
+    floats = [random.random() for _ in range(PARALLEL_MIN_SIZE)]
+    assert parallel_merge_sort(floats, 3) == sorted(floats)
@@ -0,0 +1,185 @@
+'''
+Permutations, one at a time
+
+permute() in aymptotic_notation.py collects all n! permutations into a list: for n = 10 that's 3.6M strings in memory.
+Everything here is a generator instead: it rearranges ONE list buffer in place and yields each arrangement
+as it comes, so memory stays O(n) and the caller can stop at any point.
+
+- heap_permutations:          Heap's algorithm, every next permutation is ONE swap away from the previous one
+- next_permutation:           rearranges a list into the next one in lexicographic (sorted) order, in place
+- lexicographic_permutations: sorted order, skips duplicates of repeated items (multisets),
+                              k-permutations, and can start from any rank
+- nth_permutation / permutation_rank: jump straight to the permutation with a given rank, and back,
+                              without generating the ones before it (factorial number system)
+
+Factorial number system
+The rank of a permutation of n distinct items, written in a mixed radix (n-1)!, (n-2)!, ..., 1!, 0!:
+the digit at position i is how many of the remaining items are smaller than the one at i.
+i.e., items abcd, rank 9 = 1*3! + 1*2! + 1*1! + 0*0! -> pick remaining[1]=b, then remaining[1]=c, then d, then a: bcda
+With repeated items the same walk works, only the block sizes change:
+an item v leads count(v)/m of the m!/(c1! c2! ...) distinct arrangements of the m remaining items.
+'''
+import math
+from collections import Counter
+
+
+def count_permutations(items, k=None):
+    '''
+    number of distinct permutations, m!/(c1! c2! ...) for repeated items
+    with k: number of distinct k-permutations, the ones lexicographic_permutations(items, k) yields
+        n!/(n-k)! for distinct items, with repeated items there's no closed form, it's built one item value at a time:
+        ways[t] = arrangements of length t from the values so far, adding j copies of a value (0 <= j <= its count)
+        picks j of the t + j slots for them: ways'[t + j] += ways[t] * C(t + j, j)            O(n k)
+    '''
+    items = list(items)
+    counts = Counter(items).values()
+    if k is None:
+        res = math.factorial(len(items))
+        for c in counts:
+            res //= math.factorial(c)
+        return res
+    if k < 0:
+        raise ValueError("k must be a non-negative integer")
+    ways = [1] + [0] * k
+    for c in counts:
+        new = [0] * (k + 1)
+        for t, w in enumerate(ways):
+            if w:
+                for j in range(min(c, k - t) + 1):
+                    new[t + j] += w * math.comb(t + j, j)
+        ways = new
+    return ways[k]
+
+
+def heap_permutations(items): # O(n!) total, O(1) amortized per permutation
+    '''
+    every permutation of items (repeated items give repeated permutations), NOT in sorted order
+    yields tuples, the buffer itself is private
+    '''
+    buf = list(items)
+    n = len(buf)
+    c = [0] * n # c[i]: how many times buf[i] has been swapped at this level, the explicit form of Heap's recursion
+    yield tuple(buf)
+    i = 1
+    while i < n:
+        if c[i] < i:
+            j = 0 if i % 2 == 0 else c[i]
+            buf[j], buf[i] = buf[i], buf[j]
+            yield tuple(buf)
+            c[i] += 1
+            i = 1
+        else:
+            c[i] = 0
+            i += 1
+
+
+def next_permutation(arr): # O(n)
+    '''
+    in place, like C++ std::next_permutation, returns False (and leaves arr sorted) after the last one
+    1. find the longest non-increasing tail, arr[i] is the element right before it
+    2. swap arr[i] with the rightmost tail element bigger than it
+    3. reverse the tail, so it's the smallest arrangement again
+    equal items are never swapped with each other, so a multiset's permutations come out without duplicates
+    '''
+    i = len(arr) - 2
+    while i >= 0 and not arr[i] < arr[i + 1]:
+        i -= 1
+    if i < 0:
+        arr.reverse()
+        return False
+    j = len(arr) - 1
+    while not arr[i] < arr[j]:
+        j -= 1
+    arr[i], arr[j] = arr[j], arr[i]
+    arr[i + 1:] = arr[:i:-1]
+    return True
+
+
+def lexicographic_permutations(items, k=None, start=0):
+    '''
+    distinct permutations of items in sorted order, as tuples
+    k:     k-permutations (the first k items of every arrangement), still distinct and sorted
+    start: skip the first start permutations without generating them (not with k)
+    '''
+    buf = sorted(items)
+    if k is not None and not 0 <= k <= len(buf): # like itertools.permutations: none longer than the items
+        if k < 0:
+            raise ValueError("k must be a non-negative integer")
+        return
+    if k is None or k == len(buf):
+        if start:
+            buf = nth_permutation(buf, start)
+        while True:
+            yield tuple(buf)
+            if not next_permutation(buf):
+                return
+    if start:
+        raise ValueError("start is only supported for full permutations")
+    if k == 0:
+        yield ()
+        return
+    while True:
+        yield tuple(buf[:k])
+        # the tail is not part of this k-permutation: put it in its LAST order,
+        # then the next permutation has to change the first k items
+        buf[k:] = buf[:k - 1:-1]
+        if not next_permutation(buf):
+            return
+
+
+def nth_permutation(items, rank): # O(n * distinct items)
+    '''
+    the permutation with the given rank (0-based) among the distinct permutations of items in sorted order
+    '''
+    counts = Counter(items)
+    values = sorted(counts)
+    m = sum(counts.values())
+    total = count_permutations(items)
+    if not 0 <= rank < total:
+        raise IndexError(f"rank {rank} out of range for {total} permutations")
+    res = []
+    while m:
+        for v in values:
+            if not counts[v]:
+                continue
+            block = total * counts[v] // m # permutations of the rest that start with v
+            if rank < block:
+                break
+            rank -= block
+        res.append(v)
+        total = block
+        counts[v] -= 1
+        m -= 1
+    return res
+
+def permutation_rank(perm): # O(n * distinct items)
+    '''
+    the inverse of nth_permutation: the rank of perm among the distinct permutations of its items in sorted order
+    '''
+    counts = Counter(perm)
+    values = sorted(counts)
+    m = len(perm)
+    total = count_permutations(perm)
+    rank = 0
+    for x in perm:
+        for v in values:
+            if not v < x:
+                break
+            if counts[v]:
+                rank += total * counts[v] // m
+        total = total * counts[x] // m
+        counts[x] -= 1
+        m -= 1
+    return rank
+
+
+if __name__ == "__main__":
+    import itertools
+
+    assert sorted(heap_permutations('abcd')) == sorted(itertools.permutations('abcd'))
+    assert list(lexicographic_permutations('cab')) == sorted(itertools.permutations('abc'))
+    assert list(lexicographic_permutations('aab')) == [tuple('aab'), tuple('aba'), tuple('baa')]
+    assert list(lexicographic_permutations('abcd', k=2)) == list(itertools.permutations('abcd', 2))
+    assert nth_permutation('abcd', 9) == list('bcda') and permutation_rank('bcda') == 9
+    assert list(lexicographic_permutations(range(10), start=3_628_799)) == [tuple(range(9, -1, -1))]
+    assert count_permutations('aabc', 2) == len(list(lexicographic_permutations('aabc', 2))) == 7
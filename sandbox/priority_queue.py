@@ -0,0 +1,289 @@
+'''
+Binary heap / priority queue
+
+A binary heap is a complete binary tree stored in a plain list, no node objects:
+- the children of index i are 2i + 1 and 2i + 2, the parent of i is (i - 1) // 2
+- min-heap property: every parent <= its children, so the smallest element is always at index 0
+
+Operations:
+- push:    append at the end, sift UP while smaller than the parent           O(log n)
+- pop:     take the root, move the last element to the root, sift it DOWN   O(log n)
+- heapify: sift down every non-leaf, bottom-up                              O(n)
+
+NOTE:
+Both sifts are loops with a 'hole': the moving element is held aside and the others shift into the hole,
+one write per level instead of a swap (same trick as _heapify_max in sorting_algorithms.py).
+'''
+
+
+class BinaryHeap:
+    '''
+    min-heap of comparable values
+    '''
+    __slots__ = ('_data',)
+
+    def __init__(self, iterable=()):
+        self._data = list(iterable)
+        self.heapify()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __bool__(self):
+        return bool(self._data)
+
+    def __repr__(self):
+        return f"BinaryHeap({self._data!r})"
+
+    def heapify(self): # O(n)
+        data = self._data
+        for i in range(len(data)//2 - 1, -1, -1):
+            _sift_down(data, i, len(data))
+
+    def peek(self):
+        if not self._data:
+            raise IndexError("peek from an empty heap")
+        return self._data[0]
+
+    def push(self, x): # O(log n)
+        data = self._data
+        data.append(x)
+        _sift_up(data, len(data) - 1)
+
+    def pop(self): # O(log n)
+        data = self._data
+        if not data:
+            raise IndexError("pop from an empty heap")
+        last = data.pop()
+        if not data:
+            return last
+        top, data[0] = data[0], last
+        _sift_down(data, 0, len(data))
+        return top
+
+    def pushpop(self, x): # O(log n)
+        '''
+        push x, then pop the smallest, faster than push() + pop()
+        if x is not bigger than the root, x itself would come right back out, so the heap is not touched
+        '''
+        data = self._data
+        if data and data[0] < x:
+            x, data[0] = data[0], x
+            _sift_down(data, 0, len(data))
+        return x
+
+    def replace(self, x): # O(log n)
+        '''
+        pop the smallest, then push x (the heap must not be empty, the size stays the same)
+        '''
+        data = self._data
+        if not data:
+            raise IndexError("replace on an empty heap")
+        top, data[0] = data[0], x
+        _sift_down(data, 0, len(data))
+        return top
+
+
+def _sift_up(data, pos):
+    x = data[pos]
+    while pos > 0:
+        parent = (pos - 1) >> 1
+        if not x < data[parent]:
+            break
+        data[pos] = data[parent]
+        pos = parent
+    data[pos] = x
+
+def _sift_down(data, pos, size):
+    x = data[pos]
+    child = 2 * pos + 1
+    while child < size:
+        if child + 1 < size and data[child + 1] < data[child]:
+            child += 1
+        if not data[child] < x:
+            break
+        data[pos] = data[child]
+        pos, child = child, 2 * child + 1
+    data[pos] = x
+
+
+'''
+Priority queue with decrease-key
+
+A scheduler needs to change the priority of something already queued (i.e., Dijkstra relaxing an edge).
+A plain heap can't find an element without an O(n) scan, so the queue also keeps an index map
+item -> position in the heap, updated on every move. decrease_key is then: look up, lower, sift up. O(log n)
+
+NOTE:
+Entries are [priority, order, item]. 'order' is an insertion counter, so items with the same priority
+come out first-in first-out, and the items themselves are never compared (they only need to be hashable).
+'''
+class PriorityQueue:
+    __slots__ = ('_heap', '_index', '_order')
+
+    def __init__(self, items=()):
+        '''
+        items: iterable of (item, priority) pairs
+        '''
+        self._heap = []
+        self._index = {}
+        self._order = 0
+        for item, priority in items:
+            if item in self._index:
+                raise KeyError(f"{item!r} is already queued")
+            self._append(item, priority)
+        for i in range(len(self._heap)//2 - 1, -1, -1):
+            self._sift_down(i)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __contains__(self, item):
+        return item in self._index
+
+    def __repr__(self):
+        return f"PriorityQueue({[(e[2], e[0]) for e in self._heap]!r})"
+
+    def priority(self, item):
+        return self._heap[self._index[item]][0]
+
+    def peek(self):
+        '''
+        returns (item, priority) of the smallest priority, without removing it
+        '''
+        if not self._heap:
+            raise IndexError("peek from an empty priority queue")
+        priority, _, item = self._heap[0]
+        return item, priority
+
+    def push(self, item, priority): # O(log n)
+        if item in self._index:
+            raise KeyError(f"{item!r} is already queued")
+        self._append(item, priority)
+        self._sift_up(len(self._heap) - 1)
+
+    def pop(self): # O(log n)
+        '''
+        removes and returns (item, priority) with the smallest priority
+        '''
+        heap = self._heap
+        if not heap:
+            raise IndexError("pop from an empty priority queue")
+        last = heap.pop()
+        if heap:
+            top, heap[0] = heap[0], last
+            self._index[last[2]] = 0
+            self._sift_down(0)
+        else:
+            top = last
+        del self._index[top[2]]
+        return top[2], top[0]
+
+    def decrease_key(self, item, priority): # O(log n)
+        pos = self._index[item]
+        entry = self._heap[pos]
+        if entry[0] < priority:
+            raise ValueError(f"new priority {priority!r} is bigger than the current {entry[0]!r}")
+        entry[0] = priority
+        self._sift_up(pos)
+
+    def _append(self, item, priority):
+        self._index[item] = len(self._heap)
+        self._heap.append([priority, self._order, item])
+        self._order += 1
+
+    def _sift_up(self, pos):
+        heap, index = self._heap, self._index
+        entry = heap[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[pos] = heap[parent]
+            index[heap[pos][2]] = pos
+            pos = parent
+        heap[pos] = entry
+        index[entry[2]] = pos
+
+    def _sift_down(self, pos):
+        heap, index = self._heap, self._index
+        size = len(heap)
+        entry = heap[pos]
+        child = 2 * pos + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[pos] = heap[child]
+            index[heap[pos][2]] = pos
+            pos, child = child, 2 * child + 1
+        heap[pos] = entry
+        index[entry[2]] = pos
+
+
+'''
+Top-k with a bounded heap
+
+To find the k largest of n items, keep a MIN-heap of the best k seen so far:
+its root is the weakest of them, so a new item only gets in if it beats the root (one pushpop/replace).
+- O(n log k) time, O(k) memory, and it works on any iterable, i.e., a stream that's too big to hold
+
+For the k smallest it's the mirror image, a MAX-heap of the best k, built here by flipping the comparison (_Reversed).
+'''
+def nlargest(iterable, k, key=None): # O(n log k)
+    if k <= 0:
+        return []
+    heap = BinaryHeap()
+    for order, x in enumerate(iterable):
+        entry = (x if key is None else key(x), -order, x) # -order: on ties the earlier item wins
+        if len(heap) < k:
+            heap.push(entry)
+        elif heap.peek()[:2] < entry[:2]:
+            heap.replace(entry)
+    res = []
+    while heap:
+        res.append(heap.pop()[2])
+    res.reverse()
+    return res
+
+def nsmallest(iterable, k, key=None): # O(n log k)
+    if k <= 0:
+        return []
+    heap = BinaryHeap()
+    for order, x in enumerate(iterable):
+        entry = (x if key is None else key(x), order, x)
+        if len(heap) < k:
+            heap.push(_Reversed(entry))
+        elif entry[:2] < heap.peek().entry[:2]:
+            heap.replace(_Reversed(entry))
+    res = []
+    while heap:
+        res.append(heap.pop().entry[2])
+    res.reverse()
+    return res
+
+class _Reversed:
+    __slots__ = ('entry',)
+
+    def __init__(self, entry):
+        self.entry = entry
+
+    def __lt__(self, other):
+        return other.entry[:2] < self.entry[:2]
+
+
+if __name__ == "__main__":
+    heap = BinaryHeap([8, 2, 1, 6, 7])
+    heap.push(3)
+    assert [heap.pop() for _ in range(len(heap))] == [1, 2, 3, 6, 7, 8]
+
+    pq = PriorityQueue([("backup", 5), ("deploy", 3), ("email", 9)])
+    pq.decrease_key("email", 1)
+    assert [pq.pop()[0] for _ in range(len(pq))] == ["email", "deploy", "backup"]
+
+    assert nlargest([8, 2, 1, 6, 7], 2) == [8, 7]
+    assert nsmallest([8, 2, 1, 6, 7], 2) == [1, 2]
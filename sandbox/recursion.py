@@ -26,21 +26,97 @@ When trying to figure out loop patterns, ask yourself a few questions first.
 3. Notice if you're building up some result as you go (like a sum) or just doing stuff without collecting anything
    That tells you whether you need to combine return values or just make simple recursive calls
 '''
+import functools
 
-def quick_sort_iterative(arr, low, high):
-    stack = [(low, high)]
+from sorting_algorithms import _choose_pivot, insertion_sort
+
+
+'''
+Trampoline (recursion without the call stack)
+
+Every Python call takes a frame on the interpreter stack, and past sys.getrecursionlimit() (1000 by default)
+the function dies with RecursionError, no matter how much memory is free.
+
+The trick: write the recursive function as a GENERATOR, and instead of calling itself it YIELDS the call:
+    res = yield f.step(smaller input)    # instead of: res = f(smaller input)
+trampoline() keeps the suspended generators on a plain list (an explicit stack on the heap),
+runs the yielded call, and sends its return value back into the caller that's waiting for it.
+The depth is then limited by memory, not by the recursion limit.
+An exception behaves like it would with real calls: when a call raises, it's thrown into the caller
+at its 'yield', so a try/except around the yield catches it, and otherwise it keeps going down the stack
+(running every 'finally' on the way) until nobody's left, then trampoline() raises it.
+
+@recursive wraps such a generator function so callers use it like a normal function: f(args) runs the trampoline,
+f.step(args) is the raw generator, for the recursive calls inside it.
+'''
+def trampoline(gen):
+    stack = [gen]
+    value, error = None, None
     while stack:
-        low, high = stack.pop()
+        try:
+            if error is None:
+                call = stack[-1].send(value)
+            else:
+                call = stack[-1].throw(error)
+        except StopIteration as done:
+            stack.pop()
+            value, error = done.value, None # the return value goes to the caller below
+        except BaseException as exc:
+            stack.pop() # a generator that raised is finished
+            if not stack:
+                raise
+            value, error = None, exc # the caller below gets it at its yield
+        else:
+            stack.append(call)
+            value, error = None, None # a fresh generator must be started with None
+    return value
+
+def recursive(gen_func):
+    @functools.wraps(gen_func)
+    def run(*args, **kwargs):
+        return trampoline(gen_func(*args, **kwargs))
+    run.step = gen_func
+    return run
+
+
+'''
+quick_sort_iterative is the one to use on real data (no recursion limit), so it's also the tuned one:
+1. Smaller side first: push the BIGGER partition and keep looping on the smaller one.
+   Every range taken from the stack is at most half of the one below it, so the stack holds O(log n) ranges,
+   even when the partitions are as lopsided as they get (it used to grow to O(n) on sorted input)
+2. Cutoff: ranges of threshold elements or fewer are left to insertion_sort, partitioning them costs more than it saves
+3. Median-of-three pivot (ninther on big ranges, _choose_pivot from intro_sort): sorted and reversed input no longer hit the worst case
+4. three_way=True: Dutch flag partition into < pivot | == pivot | > pivot,
+   all the copies of the pivot are done at once, so inputs with few unique values stay O(n log k) instead of degrading
+'''
+def quick_sort_iterative(arr, low, high, threshold=16, three_way=False):
+    stack = []
+    while True:
+        while high - low + 1 > max(threshold, 1):
+            mid = _choose_pivot(arr, low, high)
+            arr[low], arr[mid] = arr[mid], arr[low] # both partitions take the pivot from arr[low]
+            if three_way:
+                lt, gt = partition_three_way(arr, low, high)
+                small, big = (low, lt-1), (gt+1, high)
+            else:
+                pivot = partition(arr, low, high)
+                small, big = (low, pivot), (pivot+1, high)
+            if small[1] - small[0] > big[1] - big[0]:
+                small, big = big, small
+            stack.append(big)
+            low, high = small
         if low < high:
-            pivot = partition(arr, low, high)
-            stack.append((low, pivot))
-            stack.append((pivot+1, high))
+            insertion_sort(arr, low, high)
+        if not stack:
+            return
+        low, high = stack.pop()
 
+@recursive
 def quick_sort_recursive(arr, low, high):
     if low < high:
         pivot = partition(arr, low, high)
-        quick_sort_recursive(arr, low, pivot)
-        quick_sort_recursive(arr, pivot+1, high)
+        yield quick_sort_recursive.step(arr, low, pivot)
+        yield quick_sort_recursive.step(arr, pivot+1, high)
 
 def partition(arr, low, high):
     pivot = arr[low]
@@ -56,6 +132,27 @@ def partition(arr, low, high):
             return j
         arr[i], arr[j] = arr[j], arr[i]
 
+def partition_three_way(arr, low, high):
+    '''
+    Dijkstra's Dutch national flag, pivot = arr[low]
+    arr[low..lt-1] < pivot, arr[lt..gt] == pivot, arr[gt+1..high] > pivot, returns (lt, gt)
+    '''
+    pivot = arr[low]
+    lt, i, gt = low, low + 1, high
+    while i <= gt:
+        x = arr[i]
+        if x < pivot:
+            arr[lt], arr[i] = x, arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < x:
+            arr[i], arr[gt] = arr[gt], x
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+@recursive
 def binary_search_recursive(arr, target, left, right):
     if left > right:
         return -1
@@ -63,9 +160,23 @@ def binary_search_recursive(arr, target, left, right):
     if arr[mid] == target:
         return mid
     elif arr[mid] < target:
-        return binary_search_recursive(arr, target, mid+1, right) # important return
+        return (yield binary_search_recursive.step(arr, target, mid+1, right)) # important return
     else:
-        return binary_search_recursive(arr, target, left, mid-1)
+        return (yield binary_search_recursive.step(arr, target, left, mid-1))
+
+@recursive
+def reverse_arr(arr, left=0, right=None):
+    '''
+    swap the two ends, then reverse what's between them
+    (it used to pop(0) and append, which shifts the whole list on every level: O(n^2))
+    '''
+    if right is None:
+        right = len(arr) - 1
+    if left >= right:
+        return arr
+    arr[left], arr[right] = arr[right], arr[left]
+    yield reverse_arr.step(arr, left+1, right-1)
+    return arr
 
 if __name__ == "__main__":
     # ls = [8, 2, 6, 1, 3]
@@ -85,14 +196,33 @@ if __name__ == "__main__":
     
     # solve(5)
 
-    def reverse_arr(arr: list):
-        if not arr:
-            return arr
-        tmp = arr.pop(0)
-        reverse_arr(arr)
-        arr.append(tmp)
-    
     lst = [1,2,3,4,5,23,323,1,4,6]
     reverse_arr(lst)
 
-    print(lst)
\ No newline at end of file
+    print(lst)
+
+    deep = list(range(100_000)) # far past the recursion limit
+    reverse_arr(deep)
+    assert deep == list(range(99_999, -1, -1))
+    assert binary_search_recursive(deep[::-1], 4242, 0, len(deep)-1) == 4242
+
+    worst = list(range(5000)) # sorted input: the pivot arr[low] is the minimum, so every level peels off one element
+    quick_sort_recursive(worst, 0, len(worst)-1)
+    assert worst == list(range(5000))
+
+    @recursive
+    def checked_depth(n, cleaned): # the base case raises, the caller one level up catches it, like real recursion
+        try:
+            if n == 0:
+                raise ValueError("bottom")
+            try:
+                return (yield checked_depth.step(n - 1, cleaned))
+            except ValueError:
+                if n == 1:
+                    return "caught at 1"
+                raise
+        finally:
+            cleaned.append(n)
+
+    cleaned = []
+    assert checked_depth(3, cleaned) == "caught at 1" and cleaned == [0, 1, 2, 3]
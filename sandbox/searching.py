@@ -0,0 +1,187 @@
+'''
+Searching a sorted array, beyond "index or -1"
+
+binary_search (aymptotic_notation.py) and binary_search_recursive (recursion.py) answer one exact-match query.
+Most real lookups want the insertion point instead:
+- lower_bound(x): first index with arr[i] >= x   (same as bisect_left)
+- upper_bound(x): first index with arr[i] >  x   (same as bisect_right)
+upper_bound - lower_bound is how many times x occurs, and x is present iff lower_bound points at x.
+
+Eytzinger layout
+A sorted array is cache-unfriendly for binary search: the first probes (n/2, n/4, 3n/4, ...) are far apart.
+Storing the array in BFS order of the implicit search tree (like a heap: children of k are 2k and 2k+1)
+puts the first levels next to each other, and the descent becomes branchless:
+    k = 2k + (b[k] < x)
+At the end, k has walked past the leaves; the answer is where the path last went LEFT,
+which is k with its trailing 1-bits (the right turns) and one more bit shifted away.
+
+Batched search
+Millions of lookups against the same array: sort the queries once, then walk both sorted sequences together
+(like _merge), every answer starts from the previous one, so memory is accessed front to back.
+Galloping from the previous answer makes it O(q log q + q log(n/q)) instead of q independent O(log n) searches.
+With NumPy available this is just np.searchsorted, as long as the values and the queries are plain numbers
+(or strings): a 1-D array with a real dtype. Anything else (tuples, mixed types, huge ints) takes the merge walk.
+'''
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def lower_bound(sorted_ls, target, left=0, right=None): # O(log n)
+    if right is None:
+        right = len(sorted_ls)
+    while left < right:
+        mid = left + (right - left)//2
+        if sorted_ls[mid] < target:
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+def upper_bound(sorted_ls, target, left=0, right=None): # O(log n)
+    if right is None:
+        right = len(sorted_ls)
+    while left < right:
+        mid = left + (right - left)//2
+        if target < sorted_ls[mid]:
+            right = mid
+        else:
+            left = mid + 1
+    return left
+
+
+class SortedIndex:
+    '''
+    read-only index over sorted values, laid out in Eytzinger (BFS) order
+    '''
+    __slots__ = ('_tree', '_rank', '_values', '_array')
+
+    def __init__(self, sorted_values):
+        self._values = list(sorted_values)
+        self._array = _as_array(self._values) # for search_many, converted once
+        n = len(self._values)
+        self._tree = [None] * (n + 1) # 1-indexed, slot 0 unused
+        self._rank = [n] * (n + 1)    # tree position -> index in the sorted array
+        self._build()
+
+    def _build(self):
+        '''
+        an in-order walk of the implicit tree visits the positions in sorted order, so it hands out the values in order
+        iterative, so it doesn't depend on the recursion limit
+        '''
+        n = len(self._values)
+        stack, k, i = [], 1, 0
+        while stack or k <= n:
+            if k <= n:
+                stack.append(k)
+                k = 2 * k
+            else:
+                k = stack.pop()
+                self._tree[k] = self._values[i]
+                self._rank[k] = i
+                i += 1
+                k = 2 * k + 1
+
+    def __len__(self):
+        return len(self._values)
+
+    def lower_bound(self, target): # O(log n)
+        tree, n = self._tree, len(self._values)
+        k = 1
+        while k <= n:
+            k = 2 * k + (tree[k] < target)
+        k >>= ((~k) & (k + 1)).bit_length() # drop the trailing 1s (right turns) and the last left turn
+        return self._rank[k] if k else n
+
+    def upper_bound(self, target): # O(log n)
+        tree, n = self._tree, len(self._values)
+        k = 1
+        while k <= n:
+            k = 2 * k + (not target < tree[k])
+        k >>= ((~k) & (k + 1)).bit_length()
+        return self._rank[k] if k else n
+
+    def find(self, target):
+        '''
+        index of target in the sorted values, or -1, like binary_search
+        '''
+        i = self.lower_bound(target)
+        return i if i < len(self._values) and self._values[i] == target else -1
+
+    def __contains__(self, target):
+        return self.find(target) != -1
+
+    def search_many(self, queries, side=None):
+        return _search_many(self._values, self._array, queries, side)
+
+
+def search_many(sorted_ls, queries, side=None): # O(q log q + q log(n/q))
+    '''
+    answers every query in one pass, returns a list in the order of the queries
+    side=None    -> index of the query or -1 (binary_search semantics)
+    side='left'  -> lower_bound of every query
+    side='right' -> upper_bound of every query
+    '''
+    return _search_many(sorted_ls, _as_array(sorted_ls), queries, side)
+
+def _as_array(values):
+    '''
+    values as a 1-D NumPy array, or None when there's no NumPy or no clean conversion
+    (a list of tuples becomes 2-D, mixed types become dtype object)
+    '''
+    if np is None or not len(values):
+        return None
+    try:
+        arr = np.asarray(values)
+    except (TypeError, ValueError): # ragged, i.e., tuples of different lengths
+        return None
+    return arr if arr.ndim == 1 and arr.dtype != object else None
+
+def _search_many(sorted_ls, arr, queries, side):
+    if side not in (None, 'left', 'right'):
+        raise ValueError("side must be None, 'left' or 'right'")
+    n = len(sorted_ls)
+    if arr is not None:
+        qs = _as_array(queries)
+        if qs is not None:
+            try:
+                bounds = np.searchsorted(arr, qs, side=side or 'left')
+            except TypeError: # not comparable, i.e., string values and number queries
+                bounds = None
+            if bounds is not None:
+                if side is not None:
+                    return bounds.tolist()
+                found = bounds < n
+                found[found] = arr[bounds[found]] == qs[found]
+                return np.where(found, bounds, -1).tolist()
+
+    bound = upper_bound if side == 'right' else lower_bound
+    order = sorted(range(len(queries)), key=queries.__getitem__)
+    res = [0] * len(queries)
+    i = 0
+    for q in order:
+        target = queries[q]
+        # the answer can only move right: gallop from the previous answer (1, 2, 4, ... steps), then binary search
+        step, hi = 1, i
+        while hi < n and (not target < sorted_ls[hi] if side == 'right' else sorted_ls[hi] < target):
+            i = hi + 1
+            hi += step
+            step <<= 1
+        i = bound(sorted_ls, target, i, min(hi, n))
+        if side is None:
+            res[q] = i if i < n and sorted_ls[i] == target else -1
+        else:
+            res[q] = i
+    return res
+
+
+if __name__ == "__main__":
+    ls = [1, 2, 3, 5, 8, 8, 9, 14]
+    assert lower_bound(ls, 8) == 4 and upper_bound(ls, 8) == 6
+    index = SortedIndex(ls)
+    assert index.lower_bound(8) == 4 and index.upper_bound(8) == 6 and index.find(4) == -1
+    assert search_many(ls, [14, 4, 1, 8]) == [7, -1, 0, 4]
+    assert search_many(ls, [14, 4, 1, 8], side='right') == [8, 3, 1, 6]
+    pairs = [(1, 'a'), (1, 'b'), (3, 'a')] # 2-D for NumPy, so the merge walk
+    assert SortedIndex(pairs).search_many([(3, 'a'), (2, 'z'), (1, 'b')]) == [2, -1, 1]
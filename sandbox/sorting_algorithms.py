@@ -6,6 +6,49 @@ depending on the use of the sorted data set.
 
 NOTE: 'like' means elements that are equal
 '''
+from bisect import bisect_left, bisect_right
+from collections import deque
+from heapq import heapify, heappop, heapreplace
+from operator import index
+
+from bit_manipulation import clear_bits_from_msb, flip_bit, is_bit_set
+
+from sorting_numpy import (
+    is_ndarray, np_bubble_sort, np_selection_sort, np_insertion_sort,
+    np_merge_sort, np_quick_sort, np_heap_sort,
+)
+
+
+'''
+Every sort below also takes key= and reverse=, like sorted().
+Calling key inside the comparisons would call it O(n log n) times (or O(n^2) for the quadratic sorts),
+so instead they all decorate-sort-undecorate (Schwartzian transform):
+1. Decorate: compute key(x) ONCE per element, pair it with the element's index -> (key, index)
+2. Sort the pairs with the plain algorithm, the index breaks ties, so even unstable sorts come out stable
+   and the payload itself is never compared
+3. Undecorate: permute the payload with the sorted indices
+
+NOTE:
+reverse=True pairs the key with -index instead, then flips the result,
+so 'like' elements still come out in their original order (same as sorted(reverse=True)).
+'''
+def _sort_by_key(sort, arr, key, reverse, left=0, right=None):
+    '''
+    returns arr[left..right] as a new list, ordered by key
+    '''
+    if right is None:
+        right = len(arr) - 1
+    sign = -1 if reverse else 1
+    if key is None:
+        decorated = [(arr[i], sign * i) for i in range(left, right + 1)]
+    else:
+        decorated = [(key(arr[i]), sign * i) for i in range(left, right + 1)]
+    res = sort(decorated)
+    if res is not None: # merge_sort returns a new list instead of sorting in place
+        decorated = res
+    if reverse:
+        decorated.reverse()
+    return [arr[sign * i] for _, i in decorated]
 
 
 '''
@@ -15,10 +58,15 @@ and the higher number on the right, towards the end.
 This process is repeated and bubble sort will continue to loop through the array 
 until no swaps are made, thus leaving a sorted array.
 '''
-def bubble_sort(arr): # O(n^2)
+def bubble_sort(arr, key=None, reverse=False): # O(n^2)
     '''
     repeatedly bubbles up the largest numbers to the end
     '''
+    if key is not None or reverse:
+        arr[:] = _sort_by_key(bubble_sort, arr, key, reverse)
+        return
+    if is_ndarray(arr):
+        return np_bubble_sort(arr)
     n = len(arr)
     for i in range(n):
         for j in range(0, n - i - 1):
@@ -32,10 +80,15 @@ and the remainder numbers that have yet to be sorted.
 Selection sort finds the smallest number from the unsorted list,
 and places it at the end of the sorted one. Rinse and repeat.
 '''
-def selection_sort(arr): # O(n^2)
+def selection_sort(arr, key=None, reverse=False): # O(n^2)
     '''
     selects the smallest numbers and place them at the beginning
     '''
+    if key is not None or reverse:
+        arr[:] = _sort_by_key(selection_sort, arr, key, reverse)
+        return
+    if is_ndarray(arr):
+        return np_selection_sort(arr)
     n = len(arr)
     for i in range(n):
         for j in range(i+1, n):
@@ -48,7 +101,7 @@ O(n²). Insertion sort works by building the final, sorted array one item at a t
 The algorithm will iterate through the initial array, remove one element, 
 and place it in its proper place as a part of the sorted list.
 '''
-def insertion_sort(arr): # O(n^2)
+def insertion_sort(arr, left=0, right=None, key=None, reverse=False): # O(n^2)
     '''
     NOTE:
     most used simple algorithm, because it's:
@@ -58,12 +111,121 @@ def insertion_sort(arr): # O(n^2)
     - in-place: requires small memory to run
     - simple implementation
     '''
-    n = len(arr)
-    for i in range(n):
+    if key is not None or reverse:
+        if right is None:
+            right = len(arr) - 1
+        arr[left:right+1] = _sort_by_key(insertion_sort, arr, key, reverse, left, right)
+        return
+    if is_ndarray(arr):
+        return np_insertion_sort(arr, left, right)
+    if right is None:
+        right = len(arr) - 1
+    for i in range(left + 1, right + 1):
+        # lift arr[i] out and shift the bigger ones right into the 'hole', one write per step instead of a swap
+        x = arr[i]
         j = i
-        while j > 0 and arr[j] < arr[j-1]:
-            arr[j], arr[j-1] = arr[j-1], arr[j]
+        while j > left and x < arr[j-1]:
+            arr[j] = arr[j-1]
             j -= 1
+        arr[j] = x
+
+'''
+Binary insertion sort finds each element's spot with binary search instead of walking back one step at a time,
+then moves the whole block after that spot with ONE slice assignment (a memmove inside the list, not n Python steps).
+- O(n log n) comparisons, still O(n^2) moves, but the moves are cheap block copies
+- stable: inserts after the 'like' elements already placed (bisect_right)
+'''
+def binary_insertion_sort(arr, left=0, right=None, key=None, reverse=False): # O(n^2)
+    if right is None:
+        right = len(arr) - 1
+    if key is not None or reverse:
+        arr[left:right+1] = _sort_by_key(binary_insertion_sort, arr, key, reverse, left, right)
+        return arr
+    if is_ndarray(arr):
+        return np_insertion_sort(arr, left, right)
+    if left < right:
+        _binary_insertion(arr, left, left + 1, right + 1)
+    return arr
+
+'''
+SortedBuffer is insertion sort made 'online': items arrive one at a time and every insert keeps the buffer sorted.
+- add: binary search for the spot, list.insert shifts the tail in one block move   O(log n) compares + O(n) memmove
+- maxlen turns it into a sliding window over the stream: once full, every add evicts the OLDEST item (not the smallest)
+
+NOTE:
+Every entry is stored as (key, arrival) in a list parallel to the items, the arrival counter keeps 'like' items
+in arrival order (stable) and lets the window find exactly which entry to evict.
+'''
+class SortedBuffer:
+    __slots__ = ('_keys', '_items', '_key', '_maxlen', '_arrivals', '_count')
+
+    def __init__(self, iterable=(), key=None, maxlen=None):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self._keys, self._items = [], []
+        self._key, self._maxlen = key, maxlen
+        self._arrivals = deque() if maxlen is not None else None
+        self._count = 0
+        self.update(iterable)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, idx):
+        return self._items[idx]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, x):
+        k = x if self._key is None else self._key(x)
+        i = bisect_left(self._keys, (k,))
+        while i < len(self._keys) and self._keys[i][0] == k:
+            if self._items[i] == x:
+                return True
+            i += 1
+        return False
+
+    def __repr__(self):
+        return f"SortedBuffer({self._items!r})"
+
+    def add(self, x): # O(log n + n)
+        entry = (x if self._key is None else self._key(x), self._count)
+        self._count += 1
+        i = bisect_right(self._keys, entry)
+        self._keys.insert(i, entry)
+        self._items.insert(i, x)
+        if self._maxlen is not None:
+            self._arrivals.append(entry)
+            if len(self._items) > self._maxlen:
+                self._delete(bisect_left(self._keys, self._arrivals.popleft()))
+
+    def update(self, iterable):
+        for x in iterable:
+            self.add(x)
+
+    def remove(self, x):
+        k = x if self._key is None else self._key(x)
+        i = bisect_left(self._keys, (k,))
+        while i < len(self._keys) and self._keys[i][0] == k:
+            if self._items[i] == x:
+                if self._maxlen is not None:
+                    self._arrivals.remove(self._keys[i])
+                self._delete(i)
+                return
+            i += 1
+        raise ValueError(f"{x!r} is not in the buffer")
+
+    def pop(self, idx=-1):
+        x = self._items[idx]
+        if self._maxlen is not None:
+            self._arrivals.remove(self._keys[idx])
+        self._delete(idx)
+        return x
+
+    def _delete(self, i):
+        del self._keys[i]
+        del self._items[i]
 
 
 '''
@@ -72,7 +234,7 @@ It then ‘pairs up’ an individual with another, putting them into their prope
 with reference to each other. Merge sort then continues to pair up each sublist of numbers 
 and sort them in the process. This is continued until there is just one list remaining — the sorted array.
 '''
-def merge_sort(arr): # O(n log n)
+def merge_sort(arr, key=None, reverse=False): # O(n log n)
     '''
     - divide-and-conquer algorithm
     - stable
@@ -82,6 +244,10 @@ def merge_sort(arr): # O(n log n)
     'auxiliary processing' menas extra resources an algorithm needs beyond the input itself. 
     More formally, this is called auxiliary space or auxiliary memory.
     '''
+    if key is not None or reverse:
+        return _sort_by_key(merge_sort, arr, key, reverse)
+    if is_ndarray(arr):
+        return np_merge_sort(arr)
     if len(arr) <= 1:
         return arr
     mid = len(arr)//2
@@ -108,6 +274,213 @@ def _merge(left, right):
         j += 1
     return res    
 
+def merge_k(runs, key=None): # O(n log k)
+    '''
+    _merge for k sorted runs: instead of comparing the heads of two runs, keep the head of every run in a min-heap
+    - lazy, yields the merged values one by one, so runs can be iterators (files, generators, ...)
+    - stable, ties go to the run that comes first
+    - key: the runs are sorted by key(x), the heap holds (key(x), run, x) so x itself is never compared
+    '''
+    if key is not None:
+        decorated = [_decorate(run, key, idx) for idx, run in enumerate(runs)]
+        yield from (x for _, _, x in merge_k(decorated))
+        return
+    iters = [iter(run) for run in runs]
+    heap = []
+    for idx, it in enumerate(iters):
+        for x in it:
+            heap.append((x, idx))
+            break
+    heapify(heap)
+    while heap:
+        x, idx = heap[0]
+        yield x
+        for x in iters[idx]:
+            heapreplace(heap, (x, idx))
+            break
+        else:
+            heappop(heap)
+
+def _decorate(run, key, idx):
+    return ((key(x), idx, x) for x in run)
+
+
+'''
+Bottom-up (natural) merge sort is the iterative flavour of merge sort used by TimSort:
+1. Walk the array once and cut it into runs that are already sorted.
+   Descending runs are reversed in place, short runs are grown to MIN_RUN with insertion sort.
+2. Merge neighbouring runs pass after pass until a single run is left.
+   Every pass reads from one list and writes into the other, so only ONE auxiliary buffer is ever allocated.
+3. While merging, once one side keeps winning (MIN_GALLOP times in a row), switch to galloping:
+   exponential search for how far that side keeps winning, then copy the whole block at once.
+
+NOTE:
+On nearly-sorted data there are only a few long runs, so it takes only a few passes and it's close to linear.
+'''
+MIN_GALLOP = 7
+
+def natural_merge_sort(arr, key=None, reverse=False): # O(n log n), Omega(n)
+    '''
+    - iterative, no recursion and no slicing of the input
+    - stable
+    - sorts in place, with n auxiliary slots
+    '''
+    if key is not None or reverse:
+        arr[:] = _sort_by_key(natural_merge_sort, arr, key, reverse)
+        return arr
+    if is_ndarray(arr):
+        arr[:] = np_merge_sort(arr)
+        return arr
+    n = len(arr)
+    if n <= 1:
+        return arr
+    runs = _find_runs(arr, n, _min_run(n))
+
+    src, dst = arr, arr.copy() if isinstance(arr, list) else list(arr) # copy() keeps the type, i.e., a TrackedList
+    while len(runs) > 2:
+        merged = [0]
+        for r in range(0, len(runs) - 2, 2):
+            lo, mid, hi = runs[r], runs[r+1], runs[r+2]
+            _merge_runs(src, dst, lo, mid, hi)
+            merged.append(hi)
+        if len(runs) % 2 == 0: # odd run out, carried over as is
+            lo, hi = runs[-2], runs[-1]
+            dst[lo:hi] = src[lo:hi]
+            merged.append(hi)
+        runs = merged
+        src, dst = dst, src
+
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+def _min_run(n):
+    '''
+    same as CPython: take the 6 most significant bits of n, plus 1 if any of the remaining bits are set
+    '''
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _find_runs(arr, n, min_run):
+    runs = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            if arr[hi] < arr[lo]: # strictly descending, so reversing keeps it stable
+                while hi + 1 < n and arr[hi + 1] < arr[hi]:
+                    hi += 1
+                _reverse(arr, lo, hi)
+            else:
+                while hi + 1 < n and arr[hi + 1] >= arr[hi]:
+                    hi += 1
+            hi += 1
+        if hi - lo < min_run and hi < n:
+            end = min(lo + min_run, n)
+            _binary_insertion(arr, lo, hi, end)
+            hi = end
+        runs.append(hi)
+        lo = hi
+    return runs
+
+def _binary_insertion(arr, lo, start, hi):
+    '''
+    arr[lo:start] is already sorted, insert arr[start:hi] into it one by one
+    binary search finds the spot, then a single slice assignment shifts the tail (no neighbour swaps)
+    '''
+    for i in range(start, hi):
+        x = arr[i]
+        pos = bisect_right(arr, x, lo, i) # right-most spot keeps it stable
+        if pos < i:
+            arr[pos+1:i+1] = arr[pos:i]
+            arr[pos] = x
+
+def _reverse(arr, lo, hi):
+    while lo < hi:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+        lo += 1
+        hi -= 1
+
+def _merge_runs(src, dst, lo, mid, hi):
+    '''
+    merges src[lo:mid] and src[mid:hi] into dst[lo:hi]
+    '''
+    if not src[mid] < src[mid - 1]: # already in order
+        dst[lo:hi] = src[lo:hi]
+        return
+    i, j, k = lo, mid, lo
+    left_wins = right_wins = 0
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP: # copy every right element < src[i] in one go
+                end = _gallop_left(src, src[i], j, hi)
+                dst[k+1:k+1 + end-j] = src[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            dst[k] = src[i]
+            i += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP: # copy every left element <= src[j] in one go
+                end = _gallop_right(src, src[j], i, mid)
+                dst[k+1:k+1 + end-i] = src[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+        k += 1
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    elif j < hi:
+        dst[k:hi] = src[j:hi]
+
+def _gallop_left(arr, key, lo, hi):
+    '''
+    first index in arr[lo:hi] with arr[idx] >= key
+    exponential search (1, 3, 7, 15, ...) to bracket it, then binary search inside the bracket
+    '''
+    step, prev = 1, lo
+    while lo < hi and arr[lo] < key:
+        prev = lo + 1
+        lo += step
+        step <<= 1
+    hi = min(lo, hi)
+    lo = prev
+    while lo < hi:
+        mid = lo + (hi - lo)//2
+        if arr[mid] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _gallop_right(arr, key, lo, hi):
+    '''
+    first index in arr[lo:hi] with arr[idx] > key
+    '''
+    step, prev = 1, lo
+    while lo < hi and not key < arr[lo]:
+        prev = lo + 1
+        lo += step
+        step <<= 1
+    hi = min(lo, hi)
+    lo = prev
+    while lo < hi:
+        mid = lo + (hi - lo)//2
+        if key < arr[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
 
 '''
 Quicksort works by:
@@ -116,12 +489,19 @@ Quicksort works by:
 3. At this point, the pivot number is in the correct location, and the two groups of numbers (one on each side of the pivot number) still need to be sorted.
 4. New pivot numbers are then chosen within the remaining subsets, and this process is repeated until no swaps are made.
 '''
-def quick_sort(arr, left, right): # O(n^2), Theta(n log n)
+def quick_sort(arr, left, right, key=None, reverse=False): # O(n^2), Theta(n log n)
     '''
     - effective for its speed and small amounts of additional memory needed
     - in its base form, is an unstable sorting algorithm
     - can be fast and highly efficient, given the right circumstances
     '''
+    if key is not None or reverse:
+        if left < right:
+            sort = lambda decorated: quick_sort(decorated, 0, len(decorated) - 1)
+            arr[left:right+1] = _sort_by_key(sort, arr, key, reverse, left, right)
+        return arr
+    if is_ndarray(arr):
+        return np_quick_sort(arr, left, right)
     if left < right:
         pivot = _partition(arr, left, right)
         quick_sort(arr, left, pivot)
@@ -155,35 +535,344 @@ so its not blindly finding each number, one at a time. Heapsort adds the largest
 from the unsorted group to the sorted group, then rebuilds the heap and repeats the process, 
 adding the highest number to the sorted group.
 '''
-def heap_sort(arr): # O(n log n)
+def heap_sort(arr, left=0, right=None, key=None, reverse=False): # O(n log n)
+    '''
+    sorts arr[left..right] (inclusive), the whole array by default
+    '''
+    if key is not None or reverse:
+        if right is None:
+            right = len(arr) - 1
+        arr[left:right+1] = _sort_by_key(heap_sort, arr, key, reverse, left, right)
+        return
+    if is_ndarray(arr):
+        return np_heap_sort(arr, left, right)
+    if right is None:
+        right = len(arr) - 1
     # Build heap
-    n = len(arr)
-    last_nonleaf_idx = n//2 - 1
-    for i in range(last_nonleaf_idx, -1, -1): # start from bottom, work up to root (at i=0)
-        _heapify_max(arr, n, i)
+    # indices are absolute: the heap lives in arr[left..end-1], its root is arr[left], the children of p are
+    # 2p - left + 1 and 2p - left + 2 (no 'left +' on every access)
+    end = right + 1
+    last_nonleaf_idx = left + (end - left)//2 - 1
+    for i in range(last_nonleaf_idx, left - 1, -1): # start from bottom, work up to root (at i=left)
+        _heapify_max(arr, left, end, i)
 
     # Sort elements, fix heap
-    for i in range(n - 1, 0 , -1): # place n - 1 to the correct position, last element is auto correct
-        arr[0], arr[i] = arr[i], arr[0]
-        _heapify_max(arr, i, 0)
+    for i in range(right, left, -1): # place right .. left+1 to the correct position, the last one is auto correct
+        x = arr[i]
+        arr[i] = arr[left]
+        _replace_root_max(arr, left, i, x)
 
-def _heapify_max(arr, heap_size, root_idx):
-    maxi_root_idx = root_idx
-    left, right = 2 * root_idx + 1, 2 * root_idx + 2 
-    
-    # Find the largest among root, left child, right child
-    if left < heap_size and arr[left] > arr[maxi_root_idx]:
-        maxi_root_idx = left
-    if right < heap_size and arr[right] > arr[maxi_root_idx]:
-        maxi_root_idx = right
-
-    # If root is not the largest, swap and continue heapifying
-    if maxi_root_idx != root_idx:
-        arr[root_idx], arr[maxi_root_idx] = arr[maxi_root_idx], arr[root_idx]
-        _heapify_max(arr, heap_size, maxi_root_idx) # Recursively fix the affected subtree
+def _heapify_max(arr, lo, end, root_idx):
+    '''
+    sift-down as a loop instead of a recursive call per level
+    the root value is lifted out once and the larger children move up into the 'hole',
+    so it costs one write per level instead of a three-write swap
+    '''
+    x = arr[root_idx]
+    child = 2 * root_idx - lo + 1
+    while child < end:
+        # Find the larger child
+        if child + 1 < end and arr[child] < arr[child + 1]:
+            child += 1
+        # If root is not smaller than both children, the hole is its place
+        if not x < arr[child]:
+            break
+        arr[root_idx] = arr[child]
+        root_idx, child = child, 2 * child - lo + 1
+    arr[root_idx] = x
+
+def _replace_root_max(arr, lo, end, x):
+    '''
+    puts x at the root and sifts it down, bottom-up (Floyd):
+    x came from the bottom of the heap, so it almost always sinks back to the bottom.
+    Instead of comparing it with the larger child on every level, walk the hole all the way down
+    (1 comparison per level instead of 2), then move x up from the leaf, usually only a level or two.
+    '''
+    pos = lo
+    child = lo + 1
+    while child < end:
+        if child + 1 < end and arr[child] < arr[child + 1]:
+            child += 1
+        arr[pos] = arr[child]
+        pos, child = child, 2 * child - lo + 1
+    while pos > lo:
+        parent = (pos + lo - 1) >> 1
+        if not arr[parent] < x:
+            break
+        arr[pos] = arr[parent]
+        pos = parent
+    arr[pos] = x
+
+
+'''
+Introsort (introspective sort) is the hybrid behind most standard library sorts (i.e., C++ std::sort).
+It starts as quicksort, but watches its own recursion depth:
+1. Pivots are picked with median-of-three (or ninther on big ranges), so sorted and reverse-sorted input split evenly.
+2. Once the depth passes 2*log2(n), the partitions are clearly going badly, so the range is handed to heapsort,
+   which is O(n log n) no matter what.
+3. Small ranges are handed to insertion sort, which beats both on a handful of elements.
+
+NOTE:
+Recursing only into the smaller partition and looping on the larger one keeps the call stack at O(log n),
+so million-element lists never get close to Python's recursion limit.
+'''
+INTRO_SORT_CUTOFF = 16
+
+def intro_sort(arr, left=0, right=None, key=None, reverse=False): # O(n log n)
+    '''
+    - quicksort speed on average, heapsort guarantee in the worst case
+    - in-place, unstable (stable with key= or reverse=, see _sort_by_key)
+    '''
+    if key is not None or reverse:
+        if right is None:
+            right = len(arr) - 1
+        arr[left:right+1] = _sort_by_key(intro_sort, arr, key, reverse, left, right)
+        return arr
+    if is_ndarray(arr):
+        return np_quick_sort(arr, left, right)
+    if right is None:
+        right = len(arr) - 1
+    if left < right:
+        _intro_sort(arr, left, right, 2 * (right - left + 1).bit_length())
+    return arr
+
+def _intro_sort(arr, left, right, depth_limit):
+    while right - left + 1 > INTRO_SORT_CUTOFF:
+        if depth_limit == 0:
+            heap_sort(arr, left, right)
+            return
+        depth_limit -= 1
+
+        pivot_idx = _choose_pivot(arr, left, right)
+        arr[left], arr[pivot_idx] = arr[pivot_idx], arr[left]
+        pivot = _partition(arr, left, right)
+
+        # recurse into the smaller side, loop on the larger one
+        if pivot - left < right - pivot:
+            _intro_sort(arr, left, pivot, depth_limit)
+            left = pivot + 1
+        else:
+            _intro_sort(arr, pivot + 1, right, depth_limit)
+            right = pivot
+    insertion_sort(arr, left, right)
+
+def _choose_pivot(arr, left, right):
+    mid = left + (right - left)//2
+    if right - left + 1 < 128:
+        return _median_of_three(arr, left, mid, right)
+    # ninther: median of the medians of three evenly spaced triples
+    step = (right - left + 1)//8
+    return _median_of_three(
+        arr,
+        _median_of_three(arr, left, left + step, left + 2*step),
+        _median_of_three(arr, mid - step, mid, mid + step),
+        _median_of_three(arr, right - 2*step, right - step, right),
+    )
+
+def _median_of_three(arr, i, j, k):
+    a, b, c = arr[i], arr[j], arr[k]
+    if a < b:
+        if b < c:
+            return j
+        return k if a < c else i
+    if a < c:
+        return i
+    return k if b < c else j
     
 
 
+'''
+Selection (k-th order statistic) and partial sorting
+
+Finding the median, or the top 100 of 10M, does not need a full sort.
+Quickselect partitions like quicksort, but only keeps going into the side that contains index k:
+n + n/2 + n/4 + ... = O(n) on average.
+
+Bad pivots can still make it O(n^2), so like introsort it watches itself (introselect):
+once it has taken more than 2*log2(n) steps, pivots come from median-of-medians instead,
+which is slower per step but always throws away at least ~30% of the range, O(n) guaranteed.
+
+Median of medians:
+1. Split the range into groups of 5, sort each group (insertion sort), take each group's median
+2. Select the median of those n/5 medians (recursively), use it as the pivot
+'''
+def select(arr, k, left=0, right=None): # O(n)
+    '''
+    returns the k-th smallest element of arr[left..right] (k is an index into arr, 0-based)
+    arr is reordered so arr[k] is in its sorted position, everything before it <=, everything after it >=
+    '''
+    if right is None:
+        right = len(arr) - 1
+    if not left <= k <= right:
+        raise IndexError("k is out of range")
+    _select(arr, left, right, k)
+    return arr[k]
+
+def _select(arr, left, right, k):
+    depth_limit = 2 * (right - left + 1).bit_length()
+    while right - left + 1 > INTRO_SORT_CUTOFF:
+        if depth_limit:
+            depth_limit -= 1
+            pivot_idx = _choose_pivot(arr, left, right)
+        else:
+            pivot_idx = _median_of_medians(arr, left, right)
+        arr[left], arr[pivot_idx] = arr[pivot_idx], arr[left]
+        pivot = _partition(arr, left, right)
+        if k <= pivot:
+            right = pivot
+        else:
+            left = pivot + 1
+    insertion_sort(arr, left, right)
+
+def _median_of_medians(arr, left, right):
+    store = left
+    for group in range(left, right + 1, 5):
+        group_end = min(group + 4, right)
+        insertion_sort(arr, group, group_end)
+        median = group + (group_end - group)//2
+        arr[store], arr[median] = arr[median], arr[store] # gather the medians at the front
+        store += 1
+    mid = left + (store - 1 - left)//2
+    _select(arr, left, store - 1, mid)
+    return mid
+
+def partial_sort(arr, k, key=None): # O(n + k log k)
+    '''
+    puts the k smallest elements, sorted, in arr[:k], the rest of arr ends up in no particular order
+    '''
+    n = len(arr)
+    k = min(k, n)
+    if k <= 0:
+        return arr
+    if key is not None:
+        arr[:] = _sort_by_key(lambda decorated: partial_sort(decorated, k), arr, key, False)
+        return arr
+    if k < n:
+        select(arr, k - 1)
+    intro_sort(arr, 0, k - 1)
+    return arr
+
+def nsmallest(arr, k, key=None): # O(n + k log k)
+    '''
+    the k smallest, in order, arr itself is not modified
+    see priority_queue.nsmallest for a heap-based O(n log k) version that works on streams
+    '''
+    k = min(k, len(arr))
+    if k <= 0:
+        return []
+    decorated = [(x if key is None else key(x), i) for i, x in enumerate(arr)]
+    partial_sort(decorated, k)
+    return [arr[i] for _, i in decorated[:k]]
+
+def nlargest(arr, k, key=None): # O(n + k log k)
+    '''
+    the k largest, largest first, ties keep their original order, arr itself is not modified
+    '''
+    n = len(arr)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    decorated = [(x if key is None else key(x), -i) for i, x in enumerate(arr)]
+    if k < n:
+        select(decorated, n - k)
+    intro_sort(decorated, n - k, n - 1)
+    return [arr[-i] for _, i in reversed(decorated[n - k:])]
+
+
+'''
+Non-comparison sorts never compare two elements, they read the value itself,
+so they are not bound by the O(n log n) lower bound of comparison sorts.
+
+Counting sort counts how many times every value in [min, max] appears, then writes the values back in order.
+- O(n + k) where k = max - min + 1, only worth it when the range k is small compared to n
+
+LSD (least significant digit) radix sort sorts by one digit at a time, lowest digit first,
+with a stable bucket pass per digit, so the order from earlier (lower) digits survives.
+- digits are bytes: (x >> 8*pass) & 0xFF, see 'shift and mask' in bit_manipulation.py
+- O(n * w/8) for w-bit integers, 4 passes for 32-bit, 8 passes for 64-bit, a pass is skipped if all elements share that byte
+
+NOTE:
+Negative numbers in two's complement have the sign bit SET, so as raw bits they look bigger than positives.
+Flipping the sign bit maps [-2^(w-1), 2^(w-1)) onto [0, 2^w) in order, then the bytes can be sorted as unsigned.
+'''
+RADIX_BITS = 8
+RADIX_MASK = clear_bits_from_msb(-1, RADIX_BITS) # 0xFF
+
+def counting_sort(arr): # O(n + k)
+    if len(arr) <= 1:
+        return arr
+    lo = min(arr)
+    counts = [0] * (max(arr) - lo + 1)
+    for x in arr:
+        counts[x - lo] += 1
+    i = 0
+    for offset, c in enumerate(counts):
+        if c:
+            arr[i:i+c] = [lo + offset] * c
+            i += c
+    return arr
+
+def radix_sort(arr): # O(n * w)
+    '''
+    - stable, not in-place (one list per bucket)
+    - integers must fit in 64 bits (signed)
+    '''
+    n = len(arr)
+    if n <= 1:
+        return arr
+    width = _int_width(min(arr), max(arr))
+    if width is None:
+        raise ValueError("radix_sort only handles integers that fit in 64 bits")
+    sign_bit, mask = width - 1, (1 << width) - 1
+
+    keys = [flip_bit(x & mask, sign_bit) for x in arr]
+    for shift in range(0, width, RADIX_BITS):
+        buckets = [[] for _ in range(RADIX_MASK + 1)]
+        for u in keys:
+            buckets[(u >> shift) & RADIX_MASK].append(u)
+        if any(len(b) == n for b in buckets): # every key has the same byte here, nothing to reorder
+            continue
+        keys = [u for b in buckets for u in b]
+
+    for i, u in enumerate(keys):
+        x = flip_bit(u, sign_bit)
+        arr[i] = x - (1 << width) if is_bit_set(x, sign_bit) else x
+    return arr
+
+def _int_width(lo, hi):
+    if -(1 << 31) <= lo and hi < (1 << 31):
+        return 32
+    if -(1 << 63) <= lo and hi < (1 << 63):
+        return 64
+    return None
+
+def _is_int(x):
+    '''
+    int-like values (anything with __index__, i.e., a NumPy int or instrumentation.Tracked), but not bool
+    '''
+    try:
+        return type(index(x)) is int
+    except TypeError:
+        return False
+
+def auto_sort(arr):
+    '''
+    picks the algorithm from the data:
+    - integers in a range close to n -> counting sort
+    - other integers that fit in 64 bits -> radix sort
+    - everything else (or tiny inputs) -> intro sort
+    '''
+    n = len(arr)
+    if n <= INTRO_SORT_CUTOFF or is_ndarray(arr) or not all(type(x) is int or _is_int(x) for x in arr):
+        return intro_sort(arr)
+    lo, hi = min(arr), max(arr)
+    if hi - lo <= 2 * n:
+        return counting_sort(arr)
+    if _int_width(lo, hi) is not None:
+        return radix_sort(arr)
+    return intro_sort(arr)
+
+
 if __name__ == "__main__":
     ulst = [8,2,1,6,7]
     
@@ -199,13 +888,45 @@ if __name__ == "__main__":
     insertion_sort(lst)
     print(lst)
 
+    lst = ulst[:]
+    binary_insertion_sort(lst)
+    print(lst)
+
+    print(list(SortedBuffer(ulst)))
+
     lst = merge_sort(ulst[:])
     print(lst)
 
+    lst = ulst[:]
+    natural_merge_sort(lst)
+    print(lst)
+
     lst = ulst[:]
     quick_sort(lst, 0, len(lst)-1)
     print(lst)
 
     lst = ulst[:]
     heap_sort(lst)
-    print(lst)
\ No newline at end of file
+    print(lst)
+
+    lst = ulst[:]
+    intro_sort(lst)
+    print(lst)
+
+    lst = ulst[:]
+    radix_sort(lst)
+    print(lst)
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None: # NaNs go to the end, like np.sort, and no value is lost
+        nan = float('nan')
+        floats = np.array([3., nan, 1., 2., .5, nan, 5., 4.] * 20)
+        for sort in (bubble_sort, selection_sort, insertion_sort, natural_merge_sort, heap_sort, intro_sort,
+                     lambda a: quick_sort(a, 0, len(a) - 1)):
+            a = floats.copy()
+            sort(a)
+            assert np.array_equal(a, np.sort(floats), equal_nan=True)
+        assert np.array_equal(merge_sort(floats), np.sort(floats), equal_nan=True)
@@ -0,0 +1,207 @@
+'''
+NumPy backends for the sorts in sorting_algorithms.py
+
+Each sort in sorting_algorithms.py checks is_ndarray(arr) first and, if so, hands the array to the matching
+np_* function below. The pure-Python versions stay the reference implementation, these are the same algorithms
+rewritten so the inner loops run inside NumPy (C speed) instead of one Python-level step per element:
+- bubble sort    -> odd-even transposition sort: every pass compares ALL even (or odd) pairs at once
+- selection sort -> np.argmin over the unsorted tail
+- insertion sort -> np.searchsorted finds the spot, one slice assignment shifts the block
+- merge sort     -> small blocks sorted row-wise with odd-even passes, then merge passes with np.searchsorted
+- quick sort     -> three-way partition with boolean masks (< pivot, == pivot, > pivot)
+- heap sort      -> heap built level by level (nodes of one level have disjoint subtrees, so they sift down together)
+
+NOTE:
+NumPy is optional. Without it, np is None and is_ndarray() is always False, so nothing here is ever called.
+NaN is neither smaller nor bigger than anything, so np.minimum / np.maximum, searchsorted and the masks would
+lose or scatter it: like np.sort, every sort first moves the NaNs to the end and sorts only what's before them.
+'''
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 32 # rows sorted with odd-even passes before merging / partitions small enough to stop splitting
+
+
+def is_ndarray(arr):
+    return np is not None and isinstance(arr, np.ndarray)
+
+def _split_nan(seg):
+    '''
+    moves the NaNs of seg to its end, in place, the other values keep their order
+    returns how many values are not NaN (the part left to sort)
+    '''
+    if seg.dtype.kind not in 'fc':
+        return len(seg)
+    nan = np.isnan(seg)
+    if not nan.any():
+        return len(seg)
+    seg[:] = np.concatenate((seg[~nan], seg[nan]))
+    return len(seg) - int(nan.sum())
+
+def _odd_even_sort(rows):
+    '''
+    sorts a 1D array, or every row of a 2D array at once, in place
+    a row of width w needs at most w passes (even pairs, odd pairs, even pairs, ...),
+    stops early once neither the even nor the odd pairs are out of order
+    '''
+    width = rows.shape[-1]
+    clean_passes = 0
+    for p in range(width):
+        start = p & 1
+        a, b = rows[..., start:width-1:2], rows[..., start+1:width:2]
+        if not (a > b).any():
+            clean_passes += 1
+            if clean_passes == 2:
+                break
+            continue
+        clean_passes = 0
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        a[...] = lo
+        b[...] = hi
+
+def np_bubble_sort(arr): # O(n^2) comparisons, O(n) NumPy calls
+    _odd_even_sort(arr[:_split_nan(arr)])
+    return arr
+
+def np_selection_sort(arr): # O(n^2) comparisons, O(n) NumPy calls
+    n = _split_nan(arr)
+    for i in range(n - 1):
+        j = i + int(np.argmin(arr[i:n]))
+        if j != i:
+            arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+def np_insertion_sort(arr, left=0, right=None): # O(n^2) moves, O(n log n) comparisons
+    if right is None:
+        right = len(arr) - 1
+    right = left + _split_nan(arr[left:right+1]) - 1
+    for i in range(left + 1, right + 1):
+        x = arr[i].copy()
+        pos = left + int(np.searchsorted(arr[left:i], x, side='right')) # right-most spot keeps it stable
+        if pos < i:
+            arr[pos+1:i+1] = arr[pos:i] # NumPy buffers overlapping slices
+            arr[pos] = x
+    return arr
+
+def np_merge_sort(arr): # O(n log n)
+    '''
+    returns a new sorted array, like merge_sort does for lists
+    '''
+    a = np.array(arr, copy=True).ravel()
+    k = _split_nan(a)
+    a[:k] = _np_merge_sort(a[:k])
+    return a
+
+def _np_merge_sort(a):
+    '''
+    sorts a (no NaN), returns the sorted array: a itself or a buffer of the same size
+    '''
+    n = len(a)
+    if n <= 1:
+        return a
+    rows = n // BLOCK_SIZE
+    if rows:
+        _odd_even_sort(a[:rows * BLOCK_SIZE].reshape(rows, BLOCK_SIZE))
+    if n % BLOCK_SIZE:
+        _odd_even_sort(a[rows * BLOCK_SIZE:])
+
+    buf = np.empty_like(a)
+    width = BLOCK_SIZE
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid, hi = min(lo + width, n), min(lo + 2 * width, n)
+            _np_merge(a[lo:mid], a[mid:hi], buf[lo:hi])
+        a, buf = buf, a
+        width *= 2
+    return a
+
+def _np_merge(left, right, out):
+    '''
+    every element's final slot is its own index plus the number of elements from the other side that go before it
+    ties go to the left side (side='left' vs side='right'), so the merge is stable
+    '''
+    if not len(right):
+        out[:] = left
+        return
+    out[np.arange(len(left)) + np.searchsorted(right, left, side='left')] = left
+    out[np.arange(len(right)) + np.searchsorted(left, right, side='right')] = right
+
+def np_quick_sort(arr, left=0, right=None): # O(n^2), Theta(n log n)
+    '''
+    partitions stop at BLOCK_SIZE, then every element is at most BLOCK_SIZE slots away from its final position,
+    so a single odd-even sort over the whole range finishes all the small partitions together
+    '''
+    if right is None:
+        right = len(arr) - 1
+    right = left + _split_nan(arr[left:right+1]) - 1
+    stack = [(left, right + 1)]
+    while stack:
+        lo, hi = stack.pop()
+        seg = arr[lo:hi]
+        size = hi - lo
+        if size <= BLOCK_SIZE:
+            continue
+        pivot = sorted((seg[0], seg[size//2], seg[-1]))[1] # median-of-three
+        less, greater = seg < pivot, seg > pivot
+        n_less, n_greater = int(less.sum()), int(greater.sum())
+        seg[:] = np.concatenate((seg[less], seg[~(less | greater)], seg[greater]))
+        if n_less > 1:
+            stack.append((lo, lo + n_less))
+        if n_greater > 1:
+            stack.append((hi - n_greater, hi))
+    _odd_even_sort(arr[left:right+1])
+    return arr
+
+def np_heap_sort(arr, left=0, right=None): # O(n log n)
+    '''
+    building the heap is vectorized, popping the max is inherently one element at a time,
+    so that phase runs on a Python list copy (indexing a list is much cheaper than indexing an ndarray)
+    '''
+    if right is None:
+        right = len(arr) - 1
+    heap = arr[left:right+1]
+    heap = heap[:_split_nan(heap)]
+    n = len(heap)
+    if n <= 1:
+        return arr
+
+    # Build heap, one level at a time from the last non-leaf level up to the root
+    last_nonleaf_idx = n//2 - 1
+    level_start = (1 << ((last_nonleaf_idx + 1).bit_length() - 1)) - 1
+    while level_start >= 0:
+        nodes = np.arange(level_start, min(2 * level_start + 1, last_nonleaf_idx + 1))
+        while len(nodes):
+            child = 2 * nodes + 1
+            nodes, child = nodes[child < n], child[child < n]
+            right_child = child + 1
+            has_right = right_child < n
+            use_right = has_right.copy()
+            use_right[has_right] = heap[right_child[has_right]] > heap[child[has_right]]
+            child = np.where(use_right, right_child, child)
+            swap = heap[child] > heap[nodes]
+            nodes, child = nodes[swap], child[swap]
+            heap[nodes], heap[child] = heap[child], heap[nodes]
+            nodes = child
+        level_start = (level_start - 1) // 2 if level_start else -1
+
+    # Sort elements, fix heap
+    lst = heap.tolist()
+    for i in range(n - 1, 0, -1):
+        lst[0], lst[i] = lst[i], lst[0]
+        _sift_down(lst, i, 0)
+    heap[:] = lst
+    return arr
+
+def _sift_down(lst, heap_size, root_idx):
+    x = lst[root_idx]
+    child = 2 * root_idx + 1
+    while child < heap_size:
+        if child + 1 < heap_size and lst[child + 1] > lst[child]:
+            child += 1
+        if not lst[child] > x:
+            break
+        lst[root_idx] = lst[child]
+        root_idx, child = child, 2 * child + 1
+    lst[root_idx] = x
@@ -36,4 +36,13 @@ def func(*args, **kwargs):
 
 func(1, 2, 3, name="Bob", age=30)
 # args: (1, 2, 3)
-# kwargs: {'name': 'Bob', 'age': 30}
\ No newline at end of file
+# kwargs: {'name': 'Bob', 'age': 30}
+# Lazy joining (chained.py): both unpackings above copy every element,
+# these only keep the pieces, and copy once if materialize() is called
+from chained import ChainedSequence, LayeredMapping
+
+combined = ChainedSequence(list1, list2)
+print(combined[4], combined.materialize())  # 5 [1, 2, 3, 4, 5, 6]
+
+merged = LayeredMapping(dict1, dict2)  # later layers win, like {**dict1, **dict2}
+print(merged['c'], merged.materialize())  # 3 {'a': 1, 'b': 2, 'c': 3, 'd': 4}
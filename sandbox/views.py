@@ -0,0 +1,138 @@
+'''
+Zero-copy slices
+
+Slicing a list COPIES: arr[2:5], arr[::2] and arr[::-1] (notations.py) each build a new list,
+and merge_sort(arr[:mid]) does it on every level of the recursion. An ArrayView is a window over the original
+instead, nothing is copied until someone asks for it (tolist()):
+- view[i] reads base[start + i * step], view[i] = x writes through to the base
+- slicing a view gives another view over the SAME base, so views nest: view[1:][::-1] is still zero-copy
+- negative indices and negative steps work like on a list (a reversed view is just step -1)
+
+The index arithmetic is left to range: range(len(base))[slice] already knows how to resolve start/stop/step,
+negative indices, and a slice of a slice, and range(...)[i] maps a view index to a base index.
+
+For buffer-protocol objects (array.array, bytearray, NumPy arrays, ...) the view goes through a memoryview,
+which does the same strided access in C.
+
+NOTE:
+- a view can't change size: slice assignment must keep the length (like a memoryview)
+- while a view over an array.array is alive, the array can't grow or shrink (it's exporting its buffer)
+- anything that takes indexing and len() works on a view: the in-place sorts, lower_bound / upper_bound, ...
+'''
+
+
+class ArrayView:
+    __slots__ = ('_base', '_range', '_buf', '_mem')
+
+    def __init__(self, base, start=None, stop=None, step=None):
+        if isinstance(base, ArrayView): # a view of a view is a view of the same base
+            base, rng, buf = base._base, base._range[start:stop:step], base._buf
+        else:
+            rng = range(len(base))[start:stop:step]
+            buf = _memoryview(base)
+        self._base, self._range, self._buf = base, rng, buf
+        self._mem = buf[_as_slice(rng)] if buf is not None else None
+
+    def __len__(self):
+        return len(self._range)
+
+    def __repr__(self):
+        return f"ArrayView({self.tolist()!r})"
+
+    def __iter__(self):
+        if self._mem is not None:
+            return iter(self._mem)
+        return map(self._base.__getitem__, self._range)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __eq__(self, other):
+        if not isinstance(other, (ArrayView, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ArrayView(self, key.start, key.stop, key.step)
+        if self._mem is not None:
+            return self._mem[key]
+        return self._base[self._range[key]]
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, slice):
+            if self._mem is not None:
+                self._mem[key] = value
+            else:
+                self._base[self._range[key]] = value
+            return
+        idx = self._range[key]
+        values = list(value) # value may be a view of the same base, read it all before writing
+        if len(values) != len(idx):
+            raise ValueError(f"an ArrayView can't change size: {len(idx)} slots, {len(values)} values")
+        if self._buf is None and idx.step == 1:
+            self._base[idx.start:idx.start + len(idx)] = values
+            return
+        target = self._buf if self._buf is not None else self._base
+        for i, x in zip(idx, values):
+            target[i] = x
+
+    @property
+    def base(self):
+        return self._base
+
+    def tolist(self):
+        return list(self)
+
+    def copy(self):
+        return self.tolist()
+
+
+def _memoryview(base):
+    '''
+    a 1-D memoryview over base, or None: then the view goes through base[i]
+    memoryview() itself can refuse (TypeError: no buffer, ValueError / NotImplementedError: a format it
+    can't handle, i.e., an object-dtype NumPy array), and it only indexes native single-value formats
+    '''
+    try:
+        buf = memoryview(base)
+    except (TypeError, ValueError, NotImplementedError):
+        return None
+    if buf.ndim != 1 or buf.format.lstrip('@') not in _INDEXABLE_FORMATS:
+        buf.release()
+        return None
+    return buf
+
+_INDEXABLE_FORMATS = set('bBhHiIlLqQnNfd?ce') | {'P'}
+
+def _as_slice(rng):
+    '''
+    the slice that picks rng out of a sequence: a stop of -1 (walking down past index 0) must become None,
+    as a slice bound -1 would mean the last element (an empty range can even start at -1)
+    '''
+    if not rng:
+        return slice(0, 0)
+    return slice(rng.start, rng.stop if rng.stop >= 0 else None, rng.step)
+
+
+if __name__ == "__main__":
+    from array import array
+
+    from searching import lower_bound
+    from sorting_algorithms import insertion_sort, intro_sort, merge_sort
+
+    arr = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    assert ArrayView(arr, 2, 5) == arr[2:5] and ArrayView(arr)[::-1][1::3] == arr[::-1][1::3]
+
+    evens = ArrayView(arr, step=2)
+    evens[:] = [8, 6, 4, 2, 0] # writes through
+    assert arr == [8, 1, 6, 3, 4, 5, 2, 7, 0, 9]
+
+    intro_sort(evens) # sorts the even positions only, in place
+    assert arr == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+    nums = array('q', [5, 3, 9, 1, 7, 2])
+    tail = ArrayView(nums, 2) # through a memoryview
+    insertion_sort(tail)
+    assert nums.tolist() == [5, 3, 1, 2, 7, 9] and lower_bound(tail, 7) == 2
+    assert merge_sort(ArrayView(arr)[::-1]) == arr